@@ -1,12 +1,66 @@
 
+import math
 import time
 from . import config
+from .rgb565 import RGB565Encoder
 import wiringpi
+
+# Cost of opening one address window (CASET/RASET/RAMWR + DC toggles), in pixel-data bytes
+ROUND_WINDOW_COST = 256
+
+def round_row_spans(width, height, margin=1):
+    """Visible [x0, x1) span of every row of a circular panel inscribed in width x height"""
+    cx, cy = width / 2.0, height / 2.0
+    r = min(cx, cy) + margin
+    spans = []
+    for y in range(height):
+        dy = y + 0.5 - cy
+        if abs(dy) >= r:
+            spans.append((0, 0))
+            continue
+        half = math.sqrt(r * r - dy * dy)
+        x0 = max(0, int(math.floor(cx - half)))
+        x1 = min(width, int(math.ceil(cx + half)))
+        spans.append((x0, x1))
+    return spans
+
+def round_bands(spans, window_cost=ROUND_WINDOW_COST):
+    """Group rows into (y0, y1, x0, x1) windows minimizing bytes sent plus per-window cost"""
+    n = len(spans)
+    best = [0] + [None] * n
+    cut = [0] * (n + 1)
+    for end in range(1, n + 1):
+        x0, x1 = spans[end - 1]
+        for start in range(end - 1, -1, -1):
+            sx0, sx1 = spans[start]
+            if sx1 > sx0:
+                x0, x1 = (min(x0, sx0), max(x1, sx1)) if x1 > x0 else (sx0, sx1)
+            cost = best[start] + (end - start) * max(0, x1 - x0) * 2 + window_cost
+            if best[end] is None or cost < best[end]:
+                best[end] = cost
+                cut[end] = start
+    bands = []
+    end = n
+    while end > 0:
+        start = cut[end]
+        cols = [spans[y] for y in range(start, end) if spans[y][1] > spans[y][0]]
+        if cols:
+            bands.append((start, end, min(c[0] for c in cols), max(c[1] for c in cols)))
+        end = start
+    bands.reverse()
+    return bands
+
 class LCD_1inch28(config.OrangePi):
     wiringpi.wiringPiSetup()
 
     width = 240
     height = 240 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.encoder = RGB565Encoder(self.width, self.height)
+        self.round_spans = round_row_spans(self.width, self.height)
+        self._round_bands = None
+
     def LCD_WriteReg(self, cmd):
         self.digital_write(self.DC_PIN, 0)
         self.spi_writebyte([cmd])
@@ -15,6 +69,10 @@ class LCD_1inch28(config.OrangePi):
         self.digital_write(self.DC_PIN, 1)
         self.spi_writebyte([val])
 
+    def LCD_WriteData_Bytes(self, vals):
+        self.digital_write(self.DC_PIN, 1)
+        self.spi_writebyte(list(vals))
+
     
     def LCD_Reset(self):
         """Reset the display"""
@@ -268,59 +326,100 @@ class LCD_1inch28(config.OrangePi):
         time.sleep(0.02)
   
     def SetWindows(self, Xstart, Ystart, Xend, Yend):
+        # Xend/Yend are exclusive; the controller expects inclusive 16-bit bounds
         #set the X coordinates
         self.LCD_WriteReg(0x2A)
-        self.LCD_WriteData_Byte(0x00)               #Set the horizontal starting point to the high octet
-        self.LCD_WriteData_Byte(Xstart)      #Set the horizontal starting point to the low octet
-        self.LCD_WriteData_Byte(0x00)               #Set the horizontal end to the high octet
-        self.LCD_WriteData_Byte(Xend - 1) #Set the horizontal end to the low octet 
+        self.LCD_WriteData_Bytes(((Xstart >> 8) & 0xFF, Xstart & 0xFF,
+                                  ((Xend - 1) >> 8) & 0xFF, (Xend - 1) & 0xFF))
         
         #set the Y coordinates
         self.LCD_WriteReg(0x2B)
-        self.LCD_WriteData_Byte(0x00)
-        self.LCD_WriteData_Byte(Ystart)
-        self.LCD_WriteData_Byte(0x00)
-        self.LCD_WriteData_Byte(Yend - 1)
+        self.LCD_WriteData_Bytes(((Ystart >> 8) & 0xFF, Ystart & 0xFF,
+                                  ((Yend - 1) >> 8) & 0xFF, (Yend - 1) & 0xFF))
 
         self.LCD_WriteReg(0x2C) 
 
+    def _clip_window(self, Xstart, Ystart, Xend, Yend):
+        if Xstart > Xend:
+            Xstart, Xend = Xend, Xstart
+        if Ystart > Yend:
+            Ystart, Yend = Yend, Ystart
+        Xstart = max(0, Xstart); Xend = min(Xend, self.width)
+        Ystart = max(0, Ystart); Yend = min(Yend, self.height)
+        if Xstart >= Xend or Ystart >= Yend:
+            return None
+        return Xstart, Ystart, Xend, Yend
+
     def ShowImage_Windows(self,Xstart,Ystart,Xend,Yend,Image):
 
-        """Set buffer to value of Python Imaging Library image."""
-        """Write display buffer to physical display"""
-        imwidth, imheight = Image.size
+        """Write the [Xstart, Xend) x [Ystart, Yend) region of a full-frame image"""
+        """Image may be a PIL image or an HxWx3 uint8 array"""
+        if isinstance(Image, self.np.ndarray):
+            imheight, imwidth = Image.shape[0], Image.shape[1]
+        else:
+            imwidth, imheight = Image.size
         if imwidth != self.width or imheight != self.height:
             raise ValueError('Image must be same dimensions as display \
                 ({0}x{1}).' .format(self.width, self.height))
-        img = self.np.asarray(Image)
-        pix = self.np.zeros((self.width,self.height,2), dtype = self.np.uint8)
-        pix[...,[0]] = self.np.add(self.np.bitwise_and(img[...,[0]],0xF8),self.np.right_shift(img[...,[1]],5))
-        pix[...,[1]] = self.np.add(self.np.bitwise_and(self.np.left_shift(img[...,[1]],3),0xE0),self.np.right_shift(img[...,[2]],3))
-        pix = pix.flatten().tolist()
 
-        if Xstart > Xend:
-            data = Xstart
-            Xstart = Xend
-            Xend = data
-            
-        if (Ystart > Yend):        
-            data = Ystart
-            Ystart = Yend
-            Yend = data
-            
-        if Xstart <= 10:
-            Xstart = 10
-        if Ystart <= 10:
-            Ystart = 10
-            
-        Xstart -= 10;Xend += 10
-        Ystart -= 10;Yend += 10
-        self.SetWindows ( Xstart, Ystart, Xend, Yend)
-        self.digital_write(self.DC_PIN,1)
-        for i in range (Ystart,Yend-1):             
-            Addr = (Xstart * 2) + (i * 240 * 2) 
-            self.spi_writebyte(pix[Addr : Addr+((Xend-Xstart)*2)])
+        window = self._clip_window(Xstart, Ystart, Xend, Yend)
+        if window is None:
+            return 0
 
+        # Only the window's pixels are converted and they are already contiguous
+        pix = self.encoder.encode(Image, window)
+        self.SetWindows(*window)
+        self.digital_write(self.DC_PIN,1)
+        self.spi_writebuf(pix)
+        return len(pix)
+
+    def ShowBuffer_Windows(self,Xstart,Ystart,Xend,Yend,Buffer):
+        """Write the [Xstart, Xend) x [Ystart, Yend) region of a pre-encoded full-frame RGB565 buffer"""
+        window = self._clip_window(Xstart, Ystart, Xend, Yend)
+        if window is None:
+            return 0
+        Xstart, Ystart, Xend, Yend = window
+        pix = self.np.frombuffer(Buffer, dtype=self.np.uint16).reshape(self.height, self.width)
+        # Full-width bands are already contiguous; narrower windows need one small copy
+        pix = self.np.ascontiguousarray(pix[Ystart:Yend, Xstart:Xend])
+        self.SetWindows(*window)
+        self.digital_write(self.DC_PIN,1)
+        self.spi_writebuf(pix)
+        return pix.nbytes
+
+
+    def _build_round_table(self):
+        """Precompute the band windows and the gather index for ShowImage_Round"""
+        np = self.np
+        self._round_bands = []
+        index = []
+        offset = 0
+        for y0, y1, x0, x1 in round_bands(self.round_spans):
+            rows = np.arange(y0, y1)[:, None] * self.width + np.arange(x0, x1)[None, :]
+            index.append(rows.ravel())
+            count = rows.size
+            self._round_bands.append((x0, y0, x1, y1, offset, count))
+            offset += count
+        self._round_index = np.concatenate(index)
+        self._round_buf = np.empty(offset, dtype=np.uint16)
+
+    def ShowImage_Round(self,Image):
+        """Write a full frame, skipping the corners a round panel never shows"""
+        """Image may be a PIL image or an HxWx3 uint8 array"""
+        return self.ShowBuffer_Round(self.encoder.encode(Image))
+
+    def ShowBuffer_Round(self,Buffer):
+        """Write a pre-encoded full-frame RGB565 buffer, skipping the invisible corners"""
+        if self._round_bands is None:
+            self._build_round_table()
+        pix = self.np.frombuffer(Buffer, dtype=self.np.uint16)
+        self.np.take(pix, self._round_index, out=self._round_buf)
+        buf = memoryview(self._round_buf).cast('B')
+        for x0, y0, x1, y1, offset, count in self._round_bands:
+            self.SetWindows(x0, y0, x1, y1)
+            self.digital_write(self.DC_PIN,1)
+            self.spi_writebuf(buf[offset * 2:(offset + count) * 2])
+        return len(buf)
 
     def ShowImage(self,Image):
         """Set buffer to value of Python Imaging Library image."""
@@ -329,24 +428,18 @@ class LCD_1inch28(config.OrangePi):
         if imwidth != self.width or imheight != self.height:
             raise ValueError('Image must be same dimensions as display \
                 ({0}x{1}).' .format(self.width, self.height))
-        img = self.np.asarray(Image)
-        pix = self.np.zeros((self.width,self.height,2), dtype = self.np.uint8)
-        pix[...,[0]] = self.np.add(self.np.bitwise_and(img[...,[0]],0xF8),self.np.right_shift(img[...,[1]],5))
-        pix[...,[1]] = self.np.add(self.np.bitwise_and(self.np.left_shift(img[...,[1]],3),0xE0),self.np.right_shift(img[...,[2]],3))
-        pix = pix.flatten().tolist()
+        pix = self.encoder.encode(Image)
         self.SetWindows ( 0, 0, self.width, self.height)
         self.digital_write(self.DC_PIN,1)
-        for i in range(0,len(pix),4096):
-            self.spi_writebyte(pix[i:i+4096])
+        self.spi_writebuf(pix)
 
     
     def clear(self):
         """Clear contents of image buffer"""
-        _buffer = [0xff]*(self.width * self.height * 2)
+        _buffer = b'\xff' * (self.width * self.height * 2)
         self.SetWindows ( 0, 0, self.width, self.height)
         self.digital_write(self.DC_PIN,1)
-        for i in range(0,len(_buffer),4096):
-            self.spi_writebyte(_buffer[i:i+4096])
+        self.spi_writebuf(_buffer)
 
         
 
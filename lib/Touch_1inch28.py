@@ -1,6 +1,12 @@
 import time
+import logging
+from collections import namedtuple
 from . import config
 import wiringpi
+
+# Registers 0x01-0x06 from one burst read, stamped with when the touch happened
+TouchSample = namedtuple("TouchSample", ["time", "gesture", "fingers", "event", "x", "y"])
+
 class Touch_1inch28(config.OrangePi):
 
     def init(self):
@@ -20,13 +26,16 @@ class Touch_1inch28(config.OrangePi):
             return False
 
     def Touch_Write_Byte(self, cmd, val):
-        print(f"Writing to Register {cmd:#04x}: Value {val:#04x}")
+        logging.debug(f"Writing to Register {cmd:#04x}: Value {val:#04x}")
         self.i2c_write_byte(cmd, val)
 
 
     def Touch_Read_Byte(self, cmd):
         return self.i2c_read_byte(cmd)
 
+    def Touch_Read_Block(self, cmd, length):
+        return self.i2c_read_block(cmd, length)
+
     def WhoAmI(self):
         if (0xB5) != self.Touch_Read_Byte(0xA7):
             print('chip id is : ',[self.Touch_Read_Byte(0xA7)][0])
@@ -81,19 +90,21 @@ class Touch_1inch28(config.OrangePi):
             self.Touch_Write_Byte(0xFA,0X11)
             self.Touch_Write_Byte(0xEC,0X01)
      
+    #Read gesture, finger count and coordinates in one transaction  一次读取手势、手指数和坐标
+    def read_sample(self, timestamp=None):
+        # 0x01 gesture, 0x02 finger count, 0x03/0x04 event + X, 0x05/0x06 Y
+        timestamp = time.time() if timestamp is None else timestamp
+        data = self.Touch_Read_Block(0x01, 6)
+        sample = TouchSample(timestamp, data[0], data[1] & 0x0f, data[2] >> 6,
+                             ((data[2] & 0x0f) << 8) + data[3],
+                             ((data[4] & 0x0f) << 8) + data[5])
+        self.Gestures = sample.gesture
+        self.X_point = sample.x
+        self.Y_point = sample.y
+        return sample
+
     #Get the coordinates of the touch  获取触摸的坐标
     def get_point(self):
-        xy_point = [0,0,0,0]
-
-        xy_point[0] = self.Touch_Read_Byte(0x03)
-        xy_point[1] = self.Touch_Read_Byte(0x04)
-        xy_point[2] = self.Touch_Read_Byte(0x05)
-        xy_point[3] = self.Touch_Read_Byte(0x06)
-        
-        x_point= ((xy_point[0]&0x0f)<<8)+xy_point[1]
-        y_point= ((xy_point[2]&0x0f)<<8)+xy_point[3]
-        
-        self.X_point=x_point
-        self.Y_point=y_point
+        self.read_sample()
 
 
@@ -36,8 +36,97 @@ from smbus import SMBus
 import logging
 import numpy as np
 import wiringpi
+
+SPIDEV_BUFSIZ_PATH = "/sys/module/spidev/parameters/bufsiz"
+SPIDEV_DEFAULT_BUFSIZ = 4096
+
+
+class SpiTransport:
+    """Persistent spidev handle that pushes contiguous buffers in bufsiz chunks"""
+    def __init__(self, bus=0, device=1, speed_hz=40000000, mode=0):
+        self.bus = bus
+        self.device = device
+        self.speed_hz = speed_hz
+        self.mode = mode
+        self.chunk_size = self._read_bufsiz()
+        self.dev = None
+        self.reset_stats()
+
+    @staticmethod
+    def _read_bufsiz():
+        # The kernel rejects any single transfer larger than spidev's bufsiz
+        try:
+            with open(SPIDEV_BUFSIZ_PATH) as f:
+                return max(1, int(f.read().strip()))
+        except (OSError, ValueError):
+            return SPIDEV_DEFAULT_BUFSIZ
+
+    def open(self):
+        if self.dev is None:
+            self.dev = SpiDev()
+            self.dev.open(self.bus, self.device)
+            self.dev.mode = self.mode
+            self.dev.max_speed_hz = self.speed_hz
+        return self.dev
+
+    def close(self):
+        if self.dev is not None:
+            self.dev.close()
+            self.dev = None
+
+    def write(self, data):
+        """Write a bytes-like object (bytes, bytearray, memoryview, numpy array) or a list of ints"""
+        if self.dev is None:
+            return
+        if isinstance(data, list):
+            data = bytes(data)
+        view = memoryview(data).cast('B')
+        size = len(view)
+        chunk = self.chunk_size
+        start = time.perf_counter()
+        for offset in range(0, size, chunk):
+            self.dev.writebytes2(view[offset:offset + chunk])
+            self.transfers += 1
+        elapsed = time.perf_counter() - start
+        self.writes += 1
+        self.bytes_sent += size
+        self.busy_time += elapsed
+        self.last_write_time = elapsed
+        self.last_write_bytes = size
+        if elapsed > self.max_write_time:
+            self.max_write_time = elapsed
+
+    def reset_stats(self):
+        self.writes = 0
+        self.transfers = 0
+        self.bytes_sent = 0
+        self.busy_time = 0.0
+        self.last_write_time = 0.0
+        self.last_write_bytes = 0
+        self.max_write_time = 0.0
+
+    def stats(self):
+        """Byte and latency counters since the last reset"""
+        return {
+            'writes': self.writes,
+            'transfers': self.transfers,
+            'bytes': self.bytes_sent,
+            'busy_ms': self.busy_time * 1000.0,
+            'last_write_ms': self.last_write_time * 1000.0,
+            'last_write_bytes': self.last_write_bytes,
+            'max_write_ms': self.max_write_time * 1000.0,
+            'throughput_bps': (self.bytes_sent / self.busy_time) if self.busy_time else 0.0,
+            'chunk_size': self.chunk_size,
+            'speed_hz': self.speed_hz,
+        }
+
+
 class OrangePi:
-    def __init__(self, spi=None, spi_freq=40000000, rst=6, dc=25, bl=22, tp_int=9, tp_rst=4, bl_freq=1000):
+    # Source clock of the SoC PWM block, for hardware PWM frequency
+    PWM_CLOCK = 24000000
+
+    def __init__(self, spi=None, spi_freq=40000000, rst=6, dc=25, bl=22, tp_int=9, tp_rst=4, bl_freq=1000,
+                 bl_hw_pwm=False):
         import wiringpi
         self.np = np
         self.RST_PIN = rst
@@ -51,14 +140,15 @@ class OrangePi:
         
         self.SPEED = spi_freq
         self.BL_freq = bl_freq
+        # Backlight PWM: "hw", "soft" while a soft PWM thread runs, None while the pin is driven directly
+        self.BL_HW_PWM = bl_hw_pwm
+        self._bl_pwm = None
 
         wiringpi.wiringPiSetup()
-        # Initialize SPI
-        self.SPI = spi
-        self.SPI = SpiDev()   
-        self.SPI.open(0,1)
+        # Initialize SPI once; every register and frame write reuses this handle
+        self.transport = SpiTransport(0, 1, self.SPEED)
+        self.SPI = self.transport.open()
 
-        #self.SPI.max_speed_hz = self.SPEED
         self.I2C = SMBus(2)
         self.address = 0x15
    
@@ -79,11 +169,12 @@ class OrangePi:
  # Small delay to simulate a clock pulse, adjust as needed
     
     def spi_writebyte(self, data):
-        self.SPI = SpiDev(0,1)
-        if self.SPI is not None:   
-           self.SPI.writebytes(data)
-        self.SPI.close()
-    
+        self.transport.write(data)
+
+    def spi_writebuf(self, buf):
+        """Push a contiguous frame buffer without converting it to a Python list"""
+        self.transport.write(buf)
+
 
     def Touch_module_init(self):
         wiringpi.pinMode(self.TP_INT, wiringpi.INPUT)
@@ -96,36 +187,75 @@ class OrangePi:
 
     def i2c_read_byte(self, Addr):
         return self.I2C.read_byte_data(self.address, Addr)
+
+    def i2c_read_block(self, Addr, length):
+        """Read length consecutive registers from Addr in one transaction"""
+        return self.I2C.read_i2c_block_data(self.address, Addr, length)
         
 
+    def _bl_Init(self):
+        """Set up the backlight pin once; hardware PWM if asked for and the pin supports it"""
+        if self.BL_HW_PWM:
+            try:
+                wiringpi.pinMode(self.BL_PIN, wiringpi.PWM_OUTPUT)
+                wiringpi.pwmSetRange(100)
+                self._bl_pwm = "hw"
+                self.bl_Frequency(self.BL_freq)
+                return
+            except Exception as e:
+                logging.warning(f"Hardware PWM unavailable on pin {self.BL_PIN}, using soft PWM: {e}")
+        wiringpi.pinMode(self.BL_PIN, wiringpi.OUTPUT)
+        self._bl_pwm = None
+
+    def bl_Write(self, duty):
+        """Set the backlight duty (0-100).
+
+        Soft PWM is a wiringPi thread that wakes on every edge, 100 to 200
+        times a second, so it is created only for partial duty cycles and
+        kept for every write after that; full and off stop it and drive the
+        pin directly.
+        """
+        duty = max(0, min(100, int(duty)))
+        if self._bl_pwm == "hw":
+            wiringpi.pwmWrite(self.BL_PIN, duty)
+        elif duty in (0, 100):
+            if self._bl_pwm == "soft":
+                wiringpi.softPwmStop(self.BL_PIN)
+                wiringpi.pinMode(self.BL_PIN, wiringpi.OUTPUT)
+                self._bl_pwm = None
+            wiringpi.digitalWrite(self.BL_PIN, 1 if duty else 0)
+        elif self._bl_pwm == "soft":
+            wiringpi.softPwmWrite(self.BL_PIN, duty)
+        else:
+            wiringpi.softPwmCreate(self.BL_PIN, duty, 100)
+            self._bl_pwm = "soft"
+
     def bl_DutyCycle(self, duty):
-        wiringpi.softPwmCreate(self.BL_PIN, 0, 100)
-        wiringpi.softPwmWrite(self.BL_PIN, duty)
+        self.bl_Write(duty)
 
     def bl_Frequency(self, freq):
-        wiringpi.softPwmCreate(self.BL_PIN, 0, 100)
-        wiringpi.softPwmWrite(self.BL_PIN , freq)
+        """Backlight PWM frequency; soft PWM runs at a fixed 100 Hz"""
+        self.BL_freq = freq
+        if self._bl_pwm == "hw":
+            wiringpi.pwmSetClock(max(2, self.PWM_CLOCK // (freq * 100)))
 
     def LCD_module_init(self):
         wiringpi.pinMode(self.RST_PIN, wiringpi.OUTPUT)
         wiringpi.pinMode(self.DC_PIN, wiringpi.OUTPUT)
-        wiringpi.pinMode(self.BL_PIN, wiringpi.OUTPUT)
 
-        print("PWM Initialization:")
-        # Initialize PWM for backlight
-        wiringpi.softPwmCreate(self.BL_PIN, 0, 100)
-        wiringpi.softPwmWrite(self.BL_PIN, self.BL_freq)
+        # Backlight on at full; no PWM runs until it is dimmed
+        self._bl_Init()
+        self.bl_Write(100)
 
-        if self.SPI is not None:
-            self.SPI = wiringpi.wiringPiSPISetupMode(0, 0, self.SPEED, 0)
+        self.SPI = self.transport.open()
         return 0
     
     
     def module_exit(self):
         
         logging.debug("spi end")
-        if self.SPI is not None:
-            self.SPI = None
+        self.transport.close()
+        self.SPI = None
         if self.I2C is not None:
             self.I2C = None
 
@@ -137,7 +267,7 @@ class OrangePi:
         wiringpi.digitalWrite(self.DC_PIN, 0)
 
         wiringpi.digitalWrite(self.TP_RST, 1)
-        wiringpi.softPwmWrite(self.BL_PIN, 0)
+        self.bl_Write(0)
         time.sleep(0.001)
         wiringpi.digitalWrite(self.BL_PIN, 1)
 
@@ -0,0 +1,56 @@
+import sys
+import numpy as np
+
+
+class RGB565Encoder:
+    """Reusable RGB888 -> big-endian RGB565 converter.
+
+    The output buffer is allocated once for a full frame and reused on every
+    call, so the returned memoryview is only valid until the next encode().
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._out = np.empty(width * height, dtype=np.uint16)
+        self._tmp = np.empty(width * height, dtype=np.uint16)
+        self._swap = sys.byteorder == 'little'
+
+    def _source(self, image, box):
+        """Return the HxWx3 uint8 pixels covered by box"""
+        x0, y0, x1, y1 = box
+        if isinstance(image, np.ndarray):
+            return image[y0:y1, x0:x1]
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        if box != (0, 0) + image.size:
+            image = image.crop(box)
+        return np.asarray(image)
+
+    def encode(self, image, box=None):
+        """Encode a PIL image or HxWx3 uint8 array, optionally only box=(x0, y0, x1, y1).
+
+        Returns a memoryview over the packed big-endian pixels of the box,
+        row-major, ready to be streamed into a matching LCD window.
+        """
+        if box is None:
+            box = (0, 0, self.width, self.height)
+        src = self._source(image, box)
+        h, w = src.shape[0], src.shape[1]
+        n = h * w
+        out = self._out[:n].reshape(h, w)
+        tmp = self._tmp[:n].reshape(h, w)
+
+        # RRRRRGGG GGGBBBBB computed in place in the persistent buffers
+        np.copyto(out, src[..., 0])
+        np.bitwise_and(out, 0xF8, out=out)
+        np.left_shift(out, 8, out=out)
+        np.copyto(tmp, src[..., 1])
+        np.bitwise_and(tmp, 0xFC, out=tmp)
+        np.left_shift(tmp, 3, out=tmp)
+        np.bitwise_or(out, tmp, out=out)
+        np.copyto(tmp, src[..., 2])
+        np.right_shift(tmp, 3, out=tmp)
+        np.bitwise_or(out, tmp, out=out)
+        if self._swap:
+            out.byteswap(inplace=True)
+        return memoryview(self._out[:n]).cast('B')
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Time every menu render without display hardware
+
+Usage: python3 scripts/bench_render.py [iterations]
+
+Frames are composed and submitted exactly as on the device but never
+pushed, so the numbers isolate PIL drawing, text measurement and layout
+costs. Before each timed render the display forgets the frame on screen,
+as when another screen was shown in between, so every iteration does the
+full render instead of hitting the unchanged-frame shortcuts.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, SRC_DIR)
+sys.path.insert(0, os.path.dirname(SRC_DIR))
+os.chdir(SRC_DIR)
+
+from core.display import DisplayManager
+from utils.state import state
+from config.themes import THEMES
+from ui.menus.main_menu import MainMenu
+from ui.menus.wifi_menu import WiFiMenu
+from ui.menus.energy_menu import EnergyMenu
+from ui.menus.device_menu import DeviceMenu
+from ui.menus.confirmation import ConfirmationMenu
+from ui.menus.update_menu import UpdateMenu
+
+
+class NullDisplay(DisplayManager):
+    """DisplayManager that composes and submits frames but never touches the bus"""
+    def __init__(self):
+        super().__init__(None, round_mode=False)
+
+    def _push_frame(self, frame, encoded=None, serial=None):
+        pass
+
+
+class FakeWiFi:
+    def get_saved_networks(self):
+        return ["HomeNetwork", "A-very-long-network-name-here", "Cafe", "Office5G", "Guest"]
+
+    def get_current_ssid(self):
+        return "Cafe"
+
+
+class FakeAnalyzer:
+    # History never changes, so prefetched views stay valid
+    revision = 0
+
+    def __init__(self):
+        self.data = [{'timestamp': i * 300, 'totalPower': 400 + (i * 37) % 500, 'energyTotal': i * 0.1}
+                     for i in range(288)]
+
+    def get_time_since_last_data(self):
+        return "12s ago"
+
+    def get_24h_stats(self):
+        return {'avg_power': 512.3, 'max_power': 900.1, 'min_power': 120.2,
+                'total_energy': 12.34, 'data_points': 288}
+
+    def get_7d_stats(self):
+        return {'avg_power': 512.3, 'max_power': 900.1, 'min_power': 120.2,
+                'total_energy': 88.34, 'data_points': 336}
+
+    def get_chart_data_24h(self):
+        return self.data
+
+    def get_chart_data_7d(self):
+        return self.data + self.data[:48]
+
+    def get_power_series_24h(self):
+        return np.array([d['totalPower'] for d in self.get_chart_data_24h()], dtype=float)
+
+    def get_power_series_7d(self):
+        return np.array([d['totalPower'] for d in self.get_chart_data_7d()], dtype=float)
+
+
+class FakeUpdater:
+    def get_update_info(self):
+        return {'current': 'abc123', 'latest': 'def456', 'available': True, 'last_check': 0}
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    display = NullDisplay()
+    state.active_theme = THEMES["dark"]
+    state.energy_data = {'battery': 87, 'phases': [{'power': 120.5, 'current': 1.2},
+                                                   {'power': 300, 'current': 2.5},
+                                                   {'power': 80, 'current': 0.7}]}
+    state.energy_metrics = ["Voltage: 230.1 V", "Total Power: 500.50 W", "Energy Total: 123.4 kWh",
+                            "Runtime: 3600 sec", "Phase 1: 120.50W / 1.20A"]
+    state.device_metrics_pages = ["System load: 12%", "Uptime: 03 days 04:05", "Memory: 40% of 3.8G",
+                                  "IP: 192.168.1.20", "CPU temp: 45.2°C", "Disk: 30% of 29G",
+                                  "WiFi: Connected: HomeNetwork"]
+    state.network_to_connect = "A-very-long-network-name-here"
+
+    main_menu = MainMenu(display, state)
+    wifi_menu = WiFiMenu(display, state, FakeWiFi())
+    energy_menu = EnergyMenu(display, state, FakeAnalyzer())
+    device_menu = DeviceMenu(display, state)
+    confirmation_menu = ConfirmationMenu(display, state)
+    update_menu = UpdateMenu(display, state, FakeUpdater())
+
+    def saved_networks():
+        state.saved_networks_list = wifi_menu.wifi_service.get_saved_networks()
+        state.saved_networks_selected = 1
+        wifi_menu.render_saved_networks()
+
+    def energy_view(view_mode, chart_mode=0):
+        def render():
+            energy_menu.view_mode = view_mode
+            state.chart_mode = chart_mode
+            energy_menu.render()
+        return render
+
+    cases = [
+        ("MainMenu.render", main_menu.render),
+        ("WiFiMenu.render", wifi_menu.render),
+        ("WiFiMenu.render_saved_networks", saved_networks),
+        ("WiFiMenu.render_network_confirmation", wifi_menu.render_network_confirmation),
+        ("ConfirmationMenu.render_shutdown_confirmation", confirmation_menu.render_shutdown_confirmation),
+        ("DeviceMenu.render", device_menu.render),
+        ("EnergyMenu current/text", energy_view(0, 0)),
+        ("EnergyMenu current/bar", energy_view(0, 1)),
+        ("EnergyMenu current/line", energy_view(0, 2)),
+        ("EnergyMenu 24h", energy_view(1)),
+        ("EnergyMenu 7d", energy_view(2)),
+        ("UpdateMenu.render", update_menu.render),
+        ("BaseRenderer.render_message", lambda: main_menu.render_message("No saved\nnetworks found")),
+    ]
+
+    print(f"{'render':48s} {'mean ms':>8s} {'min ms':>8s}")
+    for name, render in cases:
+        render()  # warm caches the way a running device would
+        samples = []
+        for _ in range(iterations):
+            display._invalidate()
+            start = time.perf_counter()
+            render()
+            samples.append((time.perf_counter() - start) * 1000.0)
+        print(f"{name:48s} {sum(samples) / len(samples):8.2f} {min(samples):8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 """Configuration module"""
 from .constants import *
+from .fonts import get_font, text_length, text_bbox
 from .themes import THEMES, Theme
+from .glyphs import GlyphAtlas, TextDraw, get_atlas, prewarm_glyphs
 
-__all__ = ['THEMES', 'Theme']
\ No newline at end of file
+__all__ = ['THEMES', 'Theme', 'get_font', 'text_length', 'text_bbox',
+           'GlyphAtlas', 'TextDraw', 'get_atlas', 'prewarm_glyphs']
\ No newline at end of file
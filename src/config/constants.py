@@ -11,6 +11,8 @@ MENU_WIFI = 2
 MENU_CONFIRM_SHUTDOWN = 4
 MENU_CONFIRM_NETWORK = 5
 MENU_UPDATE = 6
+MENU_NAMES = {MENU_MAIN: "main", MENU_MQTT: "energy", MENU_WIFI: "wifi", MENU_METRICS: "device",
+              MENU_CONFIRM_SHUTDOWN: "shutdown", MENU_CONFIRM_NETWORK: "network", MENU_UPDATE: "update"}
 
 # MQTT Settings
 LOCAL_BROKER = "localhost"
@@ -23,21 +25,55 @@ TOPIC_ENERGY = "energy/metrics"
 # File paths
 LOG_FILE = "../logs/mqtt_data_log.txt"
 DB_PATH = "../logs/energy_data.db"
+LATENCY_LOG = "../logs/latency.json"
+FONT_PATH = "../Font/DejaVuSans.ttf"
+GLYPH_SIZES = (12, 14, 16, 18, 20, 24)   # UI font sizes pre-rasterized into glyph atlases
+GLYPH_STRING_CACHE = 512                  # Composed string masks kept per font
 
 # Performance settings
 STANDBY_TIMEOUT = 60
-GESTURE_DEBOUNCE = 0.25
-SCROLL_SPEED = 0.05
-RENDER_THROTTLE = 0.02
+STANDBY_FADE = 1.0           # Backlight fade-out before the panel sleeps (s)
+BACKLIGHT_MAX = 100          # Backlight duty cycle when active (PWM range is 0-100)
+BACKLIGHT_IDLE = 30          # Backlight duty cycle after BACKLIGHT_IDLE_TIMEOUT without touches
+BACKLIGHT_IDLE_TIMEOUT = 20  # Idle time before the backlight dims (s)
+BACKLIGHT_RAMP = 0.25        # Ramp back to full brightness on a touch (s)
+BACKLIGHT_HW_PWM = False     # Drive the backlight pin with hardware PWM where the board supports it
+GESTURE_QUEUE_SIZE = 32      # Gesture events buffered between the interrupt and the main loop
+GESTURE_REPEAT_GUARD = 0.1   # Same gesture read again within this is the same swipe (s)
+TARGET_FPS = 30              # Frame scheduler tick rate
+FRAME_HISTORY = 120          # Frames of render/encode/push timings kept for queries
+TOUCH_IDLE_TIMEOUT = 1.0     # Longest the main loop blocks with no events or deadlines (s)
+PREFETCH_INTERVAL = 1.0      # Re-predict prefetched frames this often while the state is unchanged (s)
+PREFETCH_MAX_FRAMES = 4      # Most speculative frames kept in the layer cache
+TIMER_RESOLUTION = 0.01      # Timer wheel tick (s)
+TIMER_SLOTS = 256            # Timer wheel slots (one turn = 2.56 s at the default tick)
+WAKE_GUARD = 0.3             # Touches this soon after waking from standby only wake (s)
+FRAME_POOL_SIZE = 4          # Spare full-screen canvases kept for reuse
+RSS_SAMPLE_INTERVAL = 600    # Seconds between process memory samples
+RSS_HISTORY = 144            # Memory samples kept (24 h at the default interval)
+LATENCY_HISTORY = 256        # Touch-to-photon traces kept per menu for percentiles
+LATENCY_TIMEOUT = 2.0        # A gesture with no frame pushed by then is dropped (s)
+LATENCY_BUCKETS = (10, 20, 50, 100, 200, 500, 1000)   # Latency histogram bucket edges (ms)
+LATENCY_DUMP_INTERVAL = 3600 # Seconds between latency dumps to the logs directory
 SSID_CACHE_DURATION = 60
 
 # Display settings
 SCREEN_WIDTH = 240
 SCREEN_HEIGHT = 240
+DIRTY_TILE_SIZE = 16         # Diff granularity for partial refresh (px)
+DIRTY_FULL_THRESHOLD = 0.6   # Push the full frame once this share of pixels changed
+DIRTY_MAX_RECTS = 8          # More windows than this collapse to one bounding box
+ROUND_MODE = True            # Skip the corners the round GC9A01 panel cannot show
 
 # UI Settings
 MAX_DISPLAY_CHARS = 18
 MAX_WRAP_WIDTH = 180
+MARQUEE_SPEED = 40           # Scroll speed of long SSIDs (px/s)
+MARQUEE_GAP = "  ...  "      # Separator before the text repeats
+SAVED_NETWORK_ROW_WIDTH = 200  # Selected saved network row, marker and check included (px)
+NETWORK_NAME_WIDTH = 180     # Network name slot of the connect dialog (px)
+TOAST_DURATION = 2.0         # How long result messages stay up (s)
+LOADING_DOT_INTERVAL = 0.5   # Loading animation step (s)
 
 # Gesture codes
 GESTURE_UP = 0x01
@@ -46,6 +82,9 @@ GESTURE_LEFT = 0x04
 GESTURE_TAP = 0x05
 GESTURE_LONG_PRESS = 0x0C
 
+# Gestures whose quick repeats merge into one event with a count: gesture -> window (s)
+GESTURE_COALESCE = {GESTURE_UP: 0.5, GESTURE_DOWN: 0.5}
+
 # Energy data analysis
 ENERGY_HISTORY_24H = []  # Store last 24h of data
 ENERGY_HISTORY_7D = []   # Store last 7d of data
@@ -0,0 +1,30 @@
+"""Process-wide font registry and text measurement cache"""
+import threading
+from functools import lru_cache
+from PIL import ImageFont
+from .constants import FONT_PATH
+
+_fonts = {}
+_fonts_lock = threading.Lock()
+
+def get_font(size=24, path=FONT_PATH):
+    """Get the shared FreeTypeFont for (path, size), parsing the TTF only once"""
+    key = (path, size)
+    font = _fonts.get(key)
+    if font is None:
+        with _fonts_lock:
+            font = _fonts.get(key)
+            if font is None:
+                font = ImageFont.truetype(path, size)
+                _fonts[key] = font
+    return font
+
+@lru_cache(maxsize=4096)
+def text_length(font, text):
+    """Memoized font.getlength(text); fonts are registry singletons so identity is a valid key"""
+    return font.getlength(text)
+
+@lru_cache(maxsize=4096)
+def text_bbox(font, text):
+    """Memoized font.getbbox(text)"""
+    return font.getbbox(text)
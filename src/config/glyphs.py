@@ -0,0 +1,138 @@
+"""Glyph atlas text engine: strings composed from pre-rasterized glyph masks"""
+import math
+import threading
+from collections import OrderedDict
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from .constants import GLYPH_SIZES, GLYPH_STRING_CACHE
+from .fonts import get_font
+
+# Every glyph the UI draws: ASCII plus the arrows, marks and emoji fallbacks
+UI_CHARSET = (
+    "".join(chr(c) for c in range(32, 127)) +
+    "▲▼➤✓✗✅❌⇄↻≡⚡📊📶⏻🔋🔔°…→←↑↓•"
+)
+
+class GlyphAtlas:
+    """Alpha masks of one font's glyphs, rasterized once, and the strings built from them.
+    
+    Positions follow FreeType's basic layout exactly: advances and pair kerning
+    are taken from the font's own measurements and each glyph lands on the
+    rounded pen position, so a composed string matches ImageDraw.text pixel for pixel.
+    """
+    def __init__(self, font):
+        self.font = font
+        self._glyphs = {}
+        self._kerning = {}
+        self._strings = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _glyph(self, ch):
+        """(mask array, x offset, y offset, advance) for one character"""
+        glyph = self._glyphs.get(ch)
+        if glyph is None:
+            core, (ox, oy) = self.font.getmask2(ch, mode="L")
+            w, h = core.size
+            mask = np.array(core, dtype=np.uint8).reshape(h, w)
+            glyph = (mask, ox, oy, self.font.getlength(ch))
+            self._glyphs[ch] = glyph
+        return glyph
+    
+    def _kern(self, left, right):
+        """Kerning adjustment between two characters"""
+        pair = left + right
+        kern = self._kerning.get(pair)
+        if kern is None:
+            kern = self.font.getlength(pair) - self._glyph(left)[3] - self._glyph(right)[3]
+            self._kerning[pair] = kern
+        return kern
+    
+    def prewarm(self, chars):
+        """Rasterize glyphs ahead of time"""
+        for ch in chars:
+            self._glyph(ch)
+    
+    def mask(self, text):
+        """Cached (L mask image, (x offset, y offset)) of a single-line string"""
+        with self._lock:
+            entry = self._strings.get(text)
+            if entry is not None:
+                self._strings.move_to_end(text)
+                return entry
+        entry = self._compose(text)
+        with self._lock:
+            self._strings[text] = entry
+            if len(self._strings) > GLYPH_STRING_CACHE:
+                self._strings.popitem(last=False)
+        return entry
+    
+    def _compose(self, text):
+        """Blit glyph masks at their pen positions into one string mask"""
+        placed = []
+        pen = 0.0
+        prev = None
+        for ch in text:
+            mask, ox, oy, advance = self._glyph(ch)
+            if prev is not None:
+                pen += self._kern(prev, ch)
+            if mask.size:
+                # FreeType rounds the 26.6 pen position to whole pixels
+                placed.append((mask, math.floor(pen + 0.5) + ox, oy))
+            pen += advance
+            prev = ch
+        
+        if not placed:
+            return Image.new("L", (0, 0)), (0, 0)
+        x0 = min(x for _, x, _ in placed)
+        y0 = min(y for _, _, y in placed)
+        x1 = max(x + m.shape[1] for m, x, _ in placed)
+        y1 = max(y + m.shape[0] for m, _, y in placed)
+        out = np.zeros((y1 - y0, x1 - x0), dtype=np.uint32)
+        for mask, x, y in placed:
+            region = out[y - y0:y - y0 + mask.shape[0], x - x0:x - x0 + mask.shape[1]]
+            # Overlapping coverage combines like FreeType's renderer: a + b - a*b/255, rounded
+            product = region * mask + 128
+            region += mask - ((product + (product >> 8)) >> 8)
+        return Image.fromarray(out.astype(np.uint8), "L"), (x0, y0)
+
+_atlases = {}
+_atlases_lock = threading.Lock()
+
+def get_atlas(font):
+    """Shared glyph atlas of a registry font"""
+    atlas = _atlases.get(font)
+    if atlas is None:
+        with _atlases_lock:
+            atlas = _atlases.get(font)
+            if atlas is None:
+                atlas = GlyphAtlas(font)
+                _atlases[font] = atlas
+    return atlas
+
+def prewarm_glyphs(sizes=GLYPH_SIZES, chars=UI_CHARSET):
+    """Rasterize the UI charset at every UI font size"""
+    for size in sizes:
+        get_atlas(get_font(size)).prewarm(chars)
+
+class TextDraw(ImageDraw.ImageDraw):
+    """ImageDraw whose plain single-line text() blits cached glyph atlas masks.
+    
+    Anything the atlas does not reproduce exactly (multiline, anchors, strokes,
+    fractional positions, non-FreeType fonts) goes to ImageDraw.text unchanged.
+    """
+    def __init__(self, image):
+        super().__init__(image)
+        self.image = image
+    
+    def text(self, xy, text, fill=None, font=None, *args, **kwargs):
+        x, y = xy
+        if (args or kwargs or fill is None or self.mode != "RGB" or
+                not isinstance(font, ImageFont.FreeTypeFont) or
+                not isinstance(text, str) or "\n" in text or "\r" in text or
+                x != int(x) or y != int(y)):
+            return super().text(xy, text, fill, font, *args, **kwargs)
+        
+        mask, (ox, oy) = get_atlas(font).mask(text)
+        if mask.width and mask.height:
+            left, top = int(x) + ox, int(y) + oy
+            self.image.paste(fill, (left, top, left + mask.width, top + mask.height), mask)
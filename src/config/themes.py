@@ -1,11 +1,11 @@
 """Theme definitions"""
-from PIL import ImageFont
+from .fonts import get_font
 
 class Theme:
     def __init__(self, name, background_path, font_path, font_size, text_color, selected_color):
         self.name = name
         self.background_path = background_path
-        self.font = ImageFont.truetype(font_path, font_size)
+        self.font = get_font(font_size, font_path)
         self.text_color = text_color
         self.selected_color = selected_color
 
@@ -1,6 +1,16 @@
 """Core system modules"""
+from .backlight import Backlight
 from .display import DisplayManager
+from .display_writer import DisplayWriter
+from .frame_pool import FramePool, MemoryMonitor
+from .latency import LatencyTracker
+from .scheduler import FrameScheduler
+from .timers import TimerWheel
 from .touch import TouchHandler
+from .touch_reader import TouchReader
 from .mqtt import MQTTManager
+from .power import PowerManager
 
-__all__ = ['DisplayManager', 'TouchHandler', 'MQTTManager']
\ No newline at end of file
+__all__ = ['Backlight', 'DisplayManager', 'DisplayWriter', 'FramePool', 'MemoryMonitor',
+           'LatencyTracker', 'FrameScheduler', 'TimerWheel', 'TouchHandler', 'TouchReader',
+           'MQTTManager', 'PowerManager']
@@ -0,0 +1,47 @@
+"""Backlight brightness"""
+import time
+from config.constants import BACKLIGHT_MAX
+
+BACKLIGHT = "backlight"
+
+class Backlight:
+    """Sets and fades the backlight duty cycle.
+    
+    The driver sets up its PWM once; this only writes new duty cycles to
+    it, and only when the level actually changes. Fades ease in and out and
+    step once per frame tick as a scheduler animation, so they never block
+    the main loop.
+    """
+    def __init__(self, display, level=BACKLIGHT_MAX):
+        self.display = display
+        self.level = level
+    
+    def set(self, level):
+        """Jump to a duty cycle, cancelling any fade"""
+        self.display.scheduler.cancel(BACKLIGHT)
+        self._write(level)
+    
+    def _write(self, level):
+        level = int(round(max(0, min(BACKLIGHT_MAX, level))))
+        if level != self.level:
+            self.display.disp.bl_Write(level)
+            self.level = level
+    
+    def fade(self, target, duration, done=None):
+        """Ramp to target over duration seconds, then call done()"""
+        start_level = self.level
+        start = time.time()
+        
+        def step():
+            progress = (time.time() - start) / duration if duration > 0 else 1.0
+            if progress >= 1.0:
+                self._write(target)
+                if done is not None:
+                    done()
+                return False
+            # Smoothstep: no visible jump at either end
+            eased = progress * progress * (3.0 - 2.0 * progress)
+            self._write(start_level + (target - start_level) * eased)
+            return True
+        
+        self.display.scheduler.animate(step, key=BACKLIGHT)
@@ -1,18 +1,85 @@
 """Display management"""
 import logging
+import threading
+import time
+from collections import deque, namedtuple
+import numpy as np
 from PIL import Image
-from config.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from config.constants import (SCREEN_WIDTH, SCREEN_HEIGHT, DIRTY_TILE_SIZE,
+                              DIRTY_FULL_THRESHOLD, DIRTY_MAX_RECTS, ROUND_MODE, FRAME_HISTORY)
+from config.glyphs import TextDraw
+from core.display_writer import DisplayWriter
+from core.frame_pool import FramePool, MemoryMonitor
+from core.latency import LatencyTracker
+from core.scheduler import FrameScheduler
+from lib.rgb565 import RGB565Encoder
+
+BYTES_PER_PIXEL = 2
+FULL_FRAME_BYTES = SCREEN_WIDTH * SCREEN_HEIGHT * BYTES_PER_PIXEL
+
+# Timing of one frame on the writer side: diff + RGB565 encode, then SPI transfer
+FramePush = namedtuple("FramePush", ["serial", "encode_ms", "push_ms", "bytes"])
+
+class CachedLayer:
+    """A composed frame kept with its packed RGB bytes and, once shown, its RGB565 encoding"""
+    def __init__(self, image):
+        self.image = image
+        self.frame = image.tobytes()
+        self.encoded = None
 
 class DisplayManager:
-    def __init__(self, disp):
+    def __init__(self, disp, round_mode=ROUND_MODE):
         self.disp = disp
+        # theme name -> decoded background, (theme name, key) -> CachedLayer
         self._background_cache = {}
+        self._layer_cache = {}
+        self._cache_lock = threading.Lock()
+        # Caller-side encoder; the driver's encoder belongs to the writer thread
+        self._encoder = RGB565Encoder(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.round_mode = round_mode and hasattr(disp, 'ShowImage_Round')
+        self._visible_mask = self._build_visible_mask() if self.round_mode else None
+        self._last_frame = None
+        self._last_submitted = None
+        # Frame on the panel when it went to sleep, with its RGB565 encoding, and the last pushed serial
+        self._resume_frame = None
+        self._pushed_serial = None
+        # Bumped whenever the submitted frame changes, so callers can tell if theirs is still up
+        self.frame_serial = 0
+        self._submit_lock = threading.Lock()
+        # Serializes frame pushes (writer thread) with register writes (callers)
+        self._bus_lock = threading.RLock()
+        self.writer = DisplayWriter(self._write_frame)
+        self.scheduler = FrameScheduler(self)
+        # Canvases handed to renderers, reused across frames
+        self.pool = FramePool()
+        self.memory = MemoryMonitor(self)
+        # Touch-to-photon traces, completed when their frame is pushed
+        self.latency = LatencyTracker()
+        self._push_times = deque(maxlen=FRAME_HISTORY)
+        # Updated from the main loop, the writer and the prefetch and task threads
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'frames': 0,
+            'full_frames': 0,
+            'partial_frames': 0,
+            'unchanged_frames': 0,
+            'unchanged_ms': 0.0,
+            'rects': 0,
+            'bytes_pushed': 0,
+            'bytes_saved': 0,
+            'last_bytes_saved': 0,
+            'skipped_frames': 0,
+            'prepared_hits': 0,
+            'prepared_misses': 0,
+        }
         
     def init(self):
         """Initialize display with optimizations"""
         self.disp.Init()
         self._optimize_performance()
-        self.disp.clear()
+        self.clear()
+        self.writer.start()
+        self.memory.start()
         
     def _optimize_performance(self):
         """Apply performance optimizations"""
@@ -24,39 +91,381 @@ class DisplayManager:
         except Exception as e:
             logging.warning(f"Could not optimize display: {e}")
     
-    def get_background_copy(self, theme):
-        """Get fresh background copy"""
+    def _load_background(self, theme):
+        """Decode a theme background once"""
         try:
             with Image.open(theme.background_path) as img:
-                new_img = Image.new("RGB", img.size)
-                new_img.paste(img)
-                return new_img
+                background = img.convert("RGB")
+            if background.size != (SCREEN_WIDTH, SCREEN_HEIGHT):
+                background = background.resize((SCREEN_WIDTH, SCREEN_HEIGHT))
+            return background
         except Exception as e:
             logging.error(f"Error loading background: {e}")
             color = (0, 0, 0) if theme.name == "dark" else (255, 255, 255)
             return Image.new("RGB", (SCREEN_WIDTH, SCREEN_HEIGHT), color=color)
     
+    def _get_background(self, theme):
+        """Cached decoded background for a theme"""
+        with self._cache_lock:
+            background = self._background_cache.get(theme.name)
+            if background is None:
+                background = self._load_background(theme)
+                self._background_cache[theme.name] = background
+            return background
+    
+    def get_background_copy(self, theme):
+        """Get a pooled canvas holding the background; release_canvas() it after showing"""
+        return self.pool.acquire(self._get_background(theme))
+    
+    def release_canvas(self, image):
+        """Hand a canvas from get_background_copy/get_layer_copy back to the pool"""
+        self.pool.release(image)
+    
+    def _get_layer(self, theme, key, draw_fn):
+        """Cached background with static content drawn on it once"""
+        cache_key = (theme.name, key)
+        with self._cache_lock:
+            layer = self._layer_cache.get(cache_key)
+        if layer is None:
+            image = self._get_background(theme).copy()
+            draw_fn(TextDraw(image))
+            layer = CachedLayer(image)
+            with self._cache_lock:
+                self._layer_cache[cache_key] = layer
+        return layer
+    
+    def get_layer_copy(self, theme, key, draw_fn):
+        """Copy of a cached layer, for menus that add dynamic content on top.
+        
+        draw_fn(draw) paints the static part and only runs on a cache miss;
+        key must capture everything besides the theme that it depends on.
+        The copy is a pooled canvas; release_canvas() it after showing.
+        """
+        return self.pool.acquire(self._get_layer(theme, key, draw_fn).image)
+    
+    def prepare_layer(self, theme, key, draw_fn):
+        """Compose and encode a static layer ahead of time so showing it is a plain push"""
+        layer = self._get_layer(theme, key, draw_fn)
+        if layer.encoded is None:
+            with self._cache_lock:
+                layer.encoded = bytes(self._encoder.encode(layer.image))
+        return layer
+    
+    def show_layer(self, theme, key, draw_fn):
+        """Display a fully static layer straight from its cached RGB565 encoding"""
+        layer = self.prepare_layer(theme, key, draw_fn)
+        self._submit(layer.frame, layer.encoded)
+    
+    def has_layer(self, theme, key):
+        """Whether a layer is cached and encoded"""
+        with self._cache_lock:
+            layer = self._layer_cache.get((theme.name, key))
+        return layer is not None and layer.encoded is not None
+    
+    def show_prepared(self, theme, key):
+        """Push a layer prepared ahead of time, e.g. by the prefetcher; False if there is none"""
+        with self._cache_lock:
+            layer = self._layer_cache.get((theme.name, key))
+        if layer is None or layer.encoded is None:
+            with self._stats_lock:
+                self.stats['prepared_misses'] += 1
+            return False
+        with self._stats_lock:
+            self.stats['prepared_hits'] += 1
+        self._submit(layer.frame, layer.encoded)
+        return True
+    
+    def invalidate_layers(self, theme, keys):
+        """Drop specific cached layers of a theme whose inputs went stale"""
+        with self._cache_lock:
+            for key in keys:
+                self._layer_cache.pop((theme.name, key), None)
+    
+    def invalidate_background_cache(self):
+        """Drop cached backgrounds and layers, e.g. after a theme change"""
+        with self._cache_lock:
+            self._background_cache.clear()
+            self._layer_cache.clear()
+    
     def show_image(self, image):
-        """Display image"""
+        """Display image, pushing only the regions that changed since the last frame.
+        
+        The pixels are snapshotted here, so the caller may reuse the image right
+        away. Frames identical to the last submitted one are skipped outright.
+        """
+        try:
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            if image.size != (SCREEN_WIDTH, SCREEN_HEIGHT):
+                raise ValueError(f"Image must be {SCREEN_WIDTH}x{SCREEN_HEIGHT}, got {image.size}")
+            frame = image.tobytes()
+        except Exception as e:
+            logging.error(f"Display error: {e}")
+            return
+        self._submit(frame)
+    
+    def show_region(self, image, x, y):
+        """Patch a region of the last submitted frame; only that window gets pushed.
+        
+        Meant for small animated areas such as a marquee band. Returns False when
+        there is no frame to patch yet, in which case the caller should redraw fully.
+        """
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        w, h = image.size
+        return self._patch([(np.asarray(image), (x, y, x + w, y + h))])
+    
+    def show_regions(self, image, boxes):
+        """Patch the given (x0, y0, x1, y1) boxes of a full-screen image into the last frame"""
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return self._patch([(np.asarray(image.crop(box)), box) for box in boxes])
+    
+    def _patch(self, pieces):
+        """Submit the last frame with (pixels, box) pieces written over it"""
+        with self._submit_lock:
+            base = self._last_submitted
+        if base is None:
+            return False
+        frame = bytearray(base)
+        pixels = np.frombuffer(frame, dtype=np.uint8).reshape(SCREEN_HEIGHT, SCREEN_WIDTH, 3)
+        for piece, (x0, y0, x1, y1) in pieces:
+            pixels[y0:y1, x0:x1] = piece[:SCREEN_HEIGHT - y0, :SCREEN_WIDTH - x0]
+        # Nothing writes to the buffer after this, so it is submitted without another copy
+        self._submit(frame)
+        return True
+    
+    def _submit(self, frame, encoded=None):
+        """Dedupe a packed RGB frame and hand it to the writer (or push it inline)"""
+        with self._submit_lock:
+            # A byte compare is exact and cheaper than hashing the frame
+            if frame == self._last_submitted:
+                with self._stats_lock:
+                    self.stats['skipped_frames'] += 1
+                return
+            self._last_submitted = frame
+            self.frame_serial += 1
+            serial = self.frame_serial
+        self.latency.frame_submitted(serial)
+        
+        if self.writer.running:
+            self.writer.submit(frame, encoded, serial)
+            return
         try:
-            self.disp.ShowImage(image)
+            self._write_frame(frame, encoded, serial)
         except Exception as e:
             logging.error(f"Display error: {e}")
     
+    def flush(self, timeout=None):
+        """Wait until every submitted frame has reached the panel"""
+        return self.writer.flush(timeout)
+    
+    def shutdown(self, timeout=2.0):
+        """Write out the pending frame and stop the writer thread"""
+        self.writer.stop(timeout)
+    
+    def _write_frame(self, frame, encoded=None, serial=None):
+        """Push a frame; if that fails, forget it was submitted so the same frame goes out again"""
+        try:
+            self._push_frame(frame, encoded, serial)
+        except Exception:
+            with self._submit_lock:
+                if self._last_submitted is frame:
+                    self._last_submitted = None
+                    # Widget screens must not patch onto a frame the panel never showed
+                    self.frame_serial += 1
+            raise
+    
+    def _push_frame(self, frame, encoded=None, serial=None):
+        """Diff a packed RGB frame against the last pushed one and send full or partial windows.
+        
+        encoded, when given, is the frame's full RGB565 encoding and is sent as is.
+        """
+        transport = getattr(self.disp, 'transport', None)
+        with self._bus_lock:
+            start = time.perf_counter()
+            busy_start = transport.busy_time if transport is not None else 0.0
+            pixels = np.frombuffer(frame, dtype=np.uint8).reshape(SCREEN_HEIGHT, SCREEN_WIDTH, 3)
+            rects = self._dirty_rects(pixels)
+            if rects is None:
+                if self.round_mode:
+                    pushed = (self.disp.ShowBuffer_Round(encoded) if encoded is not None
+                              else self.disp.ShowImage_Round(pixels))
+                elif encoded is not None:
+                    pushed = self.disp.ShowBuffer_Windows(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, encoded)
+                else:
+                    pushed = self.disp.ShowImage_Windows(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, pixels)
+            elif not rects:
+                pushed = 0
+                diff_ms = (time.perf_counter() - start) * 1000.0
+            else:
+                pushed = 0
+                for x0, y0, x1, y1 in rects:
+                    if encoded is not None:
+                        pushed += self.disp.ShowBuffer_Windows(x0, y0, x1, y1, encoded)
+                    else:
+                        pushed += self.disp.ShowImage_Windows(x0, y0, x1, y1, pixels)
+        
+            self._last_frame = pixels
+            self._pushed_serial = serial
+            total_ms = (time.perf_counter() - start) * 1000.0
+            push_ms = (transport.busy_time - busy_start) * 1000.0 if transport is not None else 0.0
+            self._push_times.append(FramePush(serial, total_ms - push_ms, push_ms, pushed))
+            if serial is not None:
+                now = time.time()
+                self.latency.frame_pushed(serial, now - push_ms / 1000.0, now)
+            saved = FULL_FRAME_BYTES - pushed
+            with self._stats_lock:
+                if rects is None:
+                    self.stats['full_frames'] += 1
+                elif not rects:
+                    self.stats['unchanged_frames'] += 1
+                    # What an identical frame costs to diff, for crediting the frames _submit skips
+                    self.stats['unchanged_ms'] += diff_ms
+                else:
+                    self.stats['partial_frames'] += 1
+                    self.stats['rects'] += len(rects)
+                self.stats['frames'] += 1
+                self.stats['bytes_pushed'] += pushed
+                self.stats['bytes_saved'] += saved
+                self.stats['last_bytes_saved'] = saved
+            if rects:
+                logging.debug(f"Partial refresh: {len(rects)} rect(s), {pushed} bytes pushed, {saved} saved")
+    
+    def get_push_times(self):
+        """Recent per-frame encode/push timings (oldest first)"""
+        return list(self._push_times)
+    
+    def _dirty_rects(self, pixels):
+        """Return changed (x0, y0, x1, y1) windows, [] if identical, or None for a full push"""
+        if self._last_frame is None:
+            return None
+        
+        changed = np.any(pixels != self._last_frame, axis=2)
+        if self._visible_mask is not None:
+            changed &= self._visible_mask
+        tile = DIRTY_TILE_SIZE
+        tiles = np.logical_or.reduceat(changed, np.arange(0, SCREEN_HEIGHT, tile), axis=0)
+        tiles = np.logical_or.reduceat(tiles, np.arange(0, SCREEN_WIDTH, tile), axis=1)
+        if not tiles.any():
+            return []
+        
+        # Horizontal runs of dirty tiles per tile row, stacked while the run repeats
+        rects = []
+        open_runs = {}
+        for row in range(tiles.shape[0]):
+            runs = {}
+            cols = np.flatnonzero(tiles[row])
+            start = prev = None
+            for col in cols:
+                if start is None:
+                    start = prev = col
+                elif col == prev + 1:
+                    prev = col
+                else:
+                    runs[(start, prev)] = open_runs.pop((start, prev), row)
+                    start = prev = col
+            if start is not None:
+                runs[(start, prev)] = open_runs.pop((start, prev), row)
+            for (c0, c1), top in open_runs.items():
+                rects.append((c0, top, c1, row - 1))
+            open_runs = runs
+        for (c0, c1), top in open_runs.items():
+            rects.append((c0, top, c1, tiles.shape[0] - 1))
+        
+        rects = [(int(c0) * tile, int(r0) * tile,
+                  min((int(c1) + 1) * tile, SCREEN_WIDTH), min((int(r1) + 1) * tile, SCREEN_HEIGHT))
+                 for c0, r0, c1, r1 in rects]
+        
+        if len(rects) > DIRTY_MAX_RECTS:
+            rects = [(min(r[0] for r in rects), min(r[1] for r in rects),
+                      max(r[2] for r in rects), max(r[3] for r in rects))]
+        
+        area = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects)
+        if area > DIRTY_FULL_THRESHOLD * SCREEN_WIDTH * SCREEN_HEIGHT:
+            return None
+        return rects
+    
+    def _build_visible_mask(self):
+        """Pixels the round panel actually shows, from the driver's row spans"""
+        mask = np.zeros((SCREEN_HEIGHT, SCREEN_WIDTH), dtype=bool)
+        for y, (x0, x1) in enumerate(self.disp.round_spans):
+            mask[y, x0:x1] = True
+        return mask
+    
+    def get_stats(self):
+        """Refresh counters plus the SPI transport's byte/latency counters"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['writer'] = self.writer.get_stats()
+        stats['pool'] = self.pool.get_stats()
+        stats['memory'] = self.memory.get_stats()
+        stats['latency'] = self.latency.get_stats()
+        # An identical frame would push nothing through the unchanged-tiles path, so skipping
+        # it saves the diff, not bus time; credit each with the mean cost of such a diff
+        if stats['unchanged_frames']:
+            stats['skipped_cpu_ms'] = stats['skipped_frames'] * stats['unchanged_ms'] / stats['unchanged_frames']
+        transport = getattr(self.disp, 'transport', None)
+        if transport is not None:
+            stats['spi'] = transport.stats()
+        return stats
+    
+    def _invalidate(self):
+        """Forget what the panel shows so the next frame is pushed in full"""
+        self._last_frame = None
+        with self._submit_lock:
+            self._last_submitted = None
+            self.frame_serial += 1
+    
     def clear(self):
         """Clear display"""
-        self.disp.clear()
+        self.writer.flush()
+        with self._bus_lock:
+            self.disp.clear()
+            self._invalidate()
     
     def sleep(self):
-        """Put display to sleep"""
+        """Put display to sleep, keeping the frame it shows encoded for wake()"""
         logging.info("Display sleep")
-        self.disp.LCD_WriteReg(0x28)
-        self.disp.LCD_WriteReg(0x10)
+        self.writer.flush()
+        with self._bus_lock:
+            frame = self._last_submitted
+            if frame is not None:
+                pixels = np.frombuffer(frame, dtype=np.uint8).reshape(SCREEN_HEIGHT, SCREEN_WIDTH, 3)
+                # The encoder's buffers are shared with prepare_layer on the prefetch and atlas threads
+                with self._cache_lock:
+                    encoded = bytes(self._encoder.encode(pixels))
+                self._resume_frame = (frame, encoded, self._pushed_serial)
+            self.disp.LCD_WriteReg(0x28)
+            self.disp.LCD_WriteReg(0x10)
     
-    def wake(self):
-        """Wake display"""
+    def wake(self, on_ready=None):
+        """Wake display on a background thread, then call on_ready().
+        
+        The panel needs 120 ms after sleep out; the caller does not wait for
+        it. Frames submitted meanwhile queue behind the wake on the bus lock.
+        """
         logging.info("Display wake")
-        self.disp.LCD_WriteReg(0x11)
-        import time
-        time.sleep(0.12)
-        self.disp.LCD_WriteReg(0x29)
\ No newline at end of file
+        threading.Thread(target=self._resume, args=(on_ready,), name="display-wake", daemon=True).start()
+    
+    def _resume(self, on_ready):
+        """Sleep out, put the frame from before sleep back in full, display on"""
+        with self._bus_lock:
+            self.disp.LCD_WriteReg(0x11)
+            time.sleep(0.12)
+            resume, self._resume_frame = self._resume_frame, None
+            # A frame pushed while asleep is newer than the kept one
+            if resume is not None and resume[2] == self._pushed_serial:
+                frame, encoded, _ = resume
+                try:
+                    if self.round_mode:
+                        self.disp.ShowBuffer_Round(encoded)
+                    else:
+                        self.disp.ShowBuffer_Windows(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, encoded)
+                    self._last_frame = np.frombuffer(frame, dtype=np.uint8).reshape(SCREEN_HEIGHT, SCREEN_WIDTH, 3)
+                except Exception as e:
+                    logging.error(f"Display error: {e}")
+                    self._invalidate()
+            self.disp.LCD_WriteReg(0x29)
+        if on_ready is not None:
+            on_ready()
@@ -0,0 +1,82 @@
+"""Background display writer with a latest-wins mailbox"""
+import logging
+import threading
+
+class DisplayWriter:
+    def __init__(self, push):
+        self._push = push
+        self._cond = threading.Condition()
+        self._pending = None
+        self._busy = False
+        self._running = False
+        self._thread = None
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+    
+    @property
+    def running(self):
+        return self._running
+    
+    def start(self):
+        """Start the writer thread"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="display-writer", daemon=True)
+        self._thread.start()
+    
+    def submit(self, *frame):
+        """Queue a frame and return immediately; an unsent older frame is dropped"""
+        with self._cond:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = frame
+            self.submitted += 1
+            self._cond.notify_all()
+    
+    def flush(self, timeout=None):
+        """Block until the mailbox is empty and no push is in flight"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._busy, timeout)
+    
+    def stop(self, timeout=2.0):
+        """Write out the pending frame, then stop the thread"""
+        self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def get_stats(self):
+        """Mailbox counters"""
+        with self._cond:
+            return {
+                'submitted': self.submitted,
+                'written': self.written,
+                'dropped': self.dropped,
+                'pending': self._pending is not None,
+            }
+    
+    def _run(self):
+        """Writer thread loop"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self._running)
+                if self._pending is None:
+                    return
+                frame = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                self._push(*frame)
+            except Exception as e:
+                logging.error(f"Display error: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self.written += 1
+                    self._cond.notify_all()
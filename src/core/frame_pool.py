@@ -0,0 +1,121 @@
+"""Reusable frame canvases and memory tracking"""
+import logging
+import threading
+import time
+from collections import deque, namedtuple
+import psutil
+from config.constants import (SCREEN_WIDTH, SCREEN_HEIGHT, FRAME_POOL_SIZE,
+                              RSS_SAMPLE_INTERVAL, RSS_HISTORY)
+
+MemorySample = namedtuple("MemorySample", ["time", "rss", "frames", "allocations"])
+
+class FramePool:
+    """Free list of full-screen RGB canvases that get refilled instead of reallocated.
+    
+    acquire() hands out a canvas holding a copy of a source image (a background
+    or cached layer). Callers release() it once the frame is submitted;
+    show_image snapshots the pixels, so that is right after the call. A canvas
+    that is never released is garbage collected and the pool allocates another.
+    """
+    def __init__(self, size=FRAME_POOL_SIZE):
+        self.size = size
+        self._free = []
+        self._lock = threading.Lock()
+        self.stats = {
+            'acquired': 0,
+            'allocated': 0,
+            'released': 0,
+            'discarded': 0,
+        }
+    
+    def acquire(self, source):
+        """Canvas filled with the pixels of source"""
+        with self._lock:
+            canvas = self._free.pop() if self._free else None
+            self.stats['acquired'] += 1
+            if canvas is None:
+                self.stats['allocated'] += 1
+        if canvas is None:
+            return source.copy()
+        canvas.paste(source)
+        return canvas
+    
+    def release(self, canvas):
+        """Return a canvas for reuse; the caller must not touch it afterwards"""
+        if canvas.mode != "RGB" or canvas.size != (SCREEN_WIDTH, SCREEN_HEIGHT):
+            return
+        with self._lock:
+            if len(self._free) < self.size and not any(c is canvas for c in self._free):
+                self._free.append(canvas)
+                self.stats['released'] += 1
+            else:
+                self.stats['discarded'] += 1
+    
+    def get_stats(self):
+        """Counters plus canvas allocations per acquired frame"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['free'] = len(self._free)
+        stats['allocs_per_frame'] = stats['allocated'] / stats['acquired'] if stats['acquired'] else 0.0
+        return stats
+
+class MemoryMonitor:
+    """Samples the process RSS at a fixed interval to show whether it levels off.
+    
+    Each sample also records the display's frame and canvas allocation counts,
+    so a growing RSS can be told apart from plain frame churn.
+    """
+    def __init__(self, display, interval=RSS_SAMPLE_INTERVAL, history=RSS_HISTORY):
+        self.display = display
+        self.interval = interval
+        self._samples = deque(maxlen=history)
+        self._process = psutil.Process()
+        self._thread = None
+    
+    def start(self):
+        """Start the sampling thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logging.error(f"Memory sample error: {e}")
+            time.sleep(self.interval)
+    
+    def sample(self):
+        """Record the current RSS"""
+        sample = MemorySample(time.time(), self._process.memory_info().rss,
+                              self.display.stats['frames'],
+                              self.display.pool.stats['allocated'])
+        self._samples.append(sample)
+        logging.debug(f"RSS {sample.rss / 1048576:.1f} MB after {sample.frames} frames, "
+                      f"{sample.allocations} canvas allocations")
+        return sample
+    
+    def samples(self):
+        """Recorded samples, oldest first"""
+        return list(self._samples)
+    
+    def get_stats(self):
+        """Current, lowest and highest RSS in MB and growth over the sampled window"""
+        samples = self.samples()
+        if not samples:
+            return {'samples': 0}
+        rss = [s.rss for s in samples]
+        first, last = samples[0], samples[-1]
+        hours = (last.time - first.time) / 3600.0
+        return {
+            'samples': len(samples),
+            'hours': hours,
+            'rss_mb': last.rss / 1048576,
+            'min_rss_mb': min(rss) / 1048576,
+            'max_rss_mb': max(rss) / 1048576,
+            'growth_mb': (last.rss - first.rss) / 1048576,
+            'growth_mb_per_hour': (last.rss - first.rss) / 1048576 / hours if hours else 0.0,
+            'frames': last.frames - first.frames,
+            'allocations': last.allocations - first.allocations,
+        }
@@ -0,0 +1,93 @@
+"""Bounded gesture event queue with duplicate filtering and coalescing"""
+import threading
+import time
+from collections import deque, namedtuple
+from config.constants import GESTURE_QUEUE_SIZE, GESTURE_REPEAT_GUARD, GESTURE_COALESCE
+
+# A gesture from the touch interrupt: first interrupt timestamp, when it was read and queued,
+# how many swipes it stands for and the (x, y) read with it, if any
+GestureEvent = namedtuple("GestureEvent", ["gesture", "time", "count", "queued", "point"])
+
+class GestureQueue:
+    """Ring buffer between the touch interrupt and the main loop.
+    
+    The controller raises several interrupts per swipe, so a repeat of the same
+    gesture within the repeat guard of the previous read is the same swipe and
+    is dropped. Separate swipes of a coalescing gesture (see GESTURE_COALESCE)
+    that arrive while the previous one is still queued merge into it, raising
+    its count, so five quick UPs come out as one "scroll by 5". When the
+    buffer is full the oldest event is dropped.
+    """
+    def __init__(self, capacity=GESTURE_QUEUE_SIZE, repeat_guard=GESTURE_REPEAT_GUARD,
+                 coalesce=GESTURE_COALESCE):
+        self.repeat_guard = repeat_guard
+        self.coalesce = dict(coalesce)
+        self._events = deque(maxlen=capacity)
+        self._tail_time = 0.0
+        self._last_read = {}
+        self._woken = False
+        self._cond = threading.Condition()
+        self.stats = {
+            'received': 0,
+            'queued': 0,
+            'duplicates': 0,
+            'coalesced': 0,
+            'dropped': 0,
+            'max_depth': 0,
+        }
+    
+    def put(self, gesture, timestamp=None, point=None):
+        """Add a gesture read in the interrupt; safe from any thread"""
+        queued = time.time()
+        timestamp = queued if timestamp is None else timestamp
+        with self._cond:
+            self.stats['received'] += 1
+            last = self._last_read.get(gesture)
+            self._last_read[gesture] = timestamp
+            if last is not None and timestamp - last < self.repeat_guard:
+                self.stats['duplicates'] += 1
+                return
+            
+            window = self.coalesce.get(gesture)
+            tail = self._events[-1] if self._events else None
+            if (window is not None and tail is not None and tail.gesture == gesture and
+                    timestamp - self._tail_time <= window):
+                self._events[-1] = tail._replace(count=tail.count + 1)
+                self.stats['coalesced'] += 1
+            else:
+                if len(self._events) == self._events.maxlen:
+                    self.stats['dropped'] += 1
+                self._events.append(GestureEvent(gesture, timestamp, 1, queued, point))
+                self.stats['queued'] += 1
+                self.stats['max_depth'] = max(self.stats['max_depth'], len(self._events))
+            self._tail_time = timestamp
+            self._cond.notify()
+    
+    def get(self, timeout=None):
+        """Oldest event, or None once the timeout passes or wake() was called"""
+        with self._cond:
+            if not self._events and not self._woken:
+                self._cond.wait(timeout)
+            self._woken = False
+            return self._events.popleft() if self._events else None
+    
+    def wake(self):
+        """Make a blocked get() return now"""
+        with self._cond:
+            self._woken = True
+            self._cond.notify()
+    
+    def clear(self):
+        """Drop every queued event"""
+        with self._cond:
+            self._events.clear()
+    
+    def __len__(self):
+        return len(self._events)
+    
+    def get_stats(self):
+        """Counters plus the current depth"""
+        with self._cond:
+            stats = dict(self.stats)
+            stats['depth'] = len(self._events)
+        return stats
@@ -0,0 +1,174 @@
+"""Touch-to-photon latency tracing"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+from config.constants import (MENU_NAMES, LATENCY_HISTORY, LATENCY_TIMEOUT, LATENCY_BUCKETS,
+                              LATENCY_LOG)
+
+# Stage boundaries of a trace, in order; each stage runs from the previous boundary to its own
+STAGES = ("read", "queue", "dispatch", "render", "encode", "push")
+
+class Trace:
+    """Timestamps of one gesture on its way to the panel"""
+    __slots__ = ("menu", "isr", "times", "serial")
+    
+    def __init__(self, menu, isr, read, dispatch):
+        self.menu = menu
+        self.isr = isr
+        self.times = {'read': read, 'queue': dispatch}
+        self.serial = None
+    
+    def mark(self, stage, when):
+        self.times[stage] = when
+    
+    def durations(self):
+        """Milliseconds per stage plus the total; boundaries never run backwards"""
+        result = {}
+        previous = self.isr
+        for stage in STAGES:
+            when = max(self.times.get(stage, previous), previous)
+            result[stage] = (when - previous) * 1000.0
+            previous = when
+        result['total'] = (previous - self.isr) * 1000.0
+        return result
+
+class LatencyTracker:
+    """Per-menu histograms of the time from the touch interrupt to the last SPI byte.
+    
+    A trace starts when the main loop dispatches a gesture, carrying the
+    interrupt timestamp and the time the reader queued it; gestures the menus
+    did not take are discarded. Only frames submitted inside attribute(), by
+    the gesture's handler or the scheduler's screen redraw, count: the first
+    such frame is the gesture's frame, and the trace completes when the
+    writer finishes pushing that frame or a later one (a newer frame can
+    replace it in the writer's mailbox). Animations, toasts and other threads
+    drawing meanwhile are not credited. Gestures that produce no frame, say
+    because nothing changed, expire after LATENCY_TIMEOUT.
+    """
+    def __init__(self, history=LATENCY_HISTORY, timeout=LATENCY_TIMEOUT, buckets=LATENCY_BUCKETS):
+        self.timeout = timeout
+        self.buckets = tuple(buckets)
+        self._history = history
+        self._open = []
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+        # Thread whose submitted frames currently belong to the open traces
+        self._owner = None
+        self.stats = {
+            'traces': 0,
+            'completed': 0,
+            'expired': 0,
+            'discarded': 0,
+        }
+    
+    def begin(self, event, menu, now=None):
+        """Start tracing a gesture event as the main loop picks it up"""
+        now = time.time() if now is None else now
+        trace = Trace(menu, event.time, event.queued, now)
+        with self._lock:
+            self._expire(now)
+            self._open.append(trace)
+            self.stats['traces'] += 1
+        return trace
+    
+    def handled(self, trace, now=None):
+        """The menu handler returned; whatever is drawn next belongs to the render stage"""
+        trace.mark('dispatch', time.time() if now is None else now)
+    
+    def discard(self, trace):
+        """The gesture was not routed to a menu; drop its trace"""
+        with self._lock:
+            if trace in self._open:
+                self._open.remove(trace)
+                self.stats['discarded'] += 1
+    
+    @contextmanager
+    def attribute(self):
+        """Frames this thread submits inside the block belong to the open traces"""
+        previous, self._owner = self._owner, threading.get_ident()
+        try:
+            yield
+        finally:
+            self._owner = previous
+    
+    def frame_submitted(self, serial, now=None):
+        """A frame went to the writer; inside attribute() it is the frame of every trace still waiting for one"""
+        if self._owner != threading.get_ident():
+            return
+        with self._lock:
+            if not self._open:
+                return
+            now = time.time() if now is None else now
+            for trace in self._open:
+                if trace.serial is None:
+                    trace.serial = serial
+                    trace.mark('render', now)
+    
+    def frame_pushed(self, serial, encoded, pushed):
+        """The writer finished encoding at encoded and sent the last byte at pushed"""
+        with self._lock:
+            if not self._open:
+                return
+            done = [t for t in self._open if t.serial is not None and t.serial <= serial]
+            if not done:
+                return
+            self._open = [t for t in self._open if t not in done]
+            for trace in done:
+                trace.mark('encode', encoded)
+                trace.mark('push', pushed)
+                self._record(trace)
+    
+    def _record(self, trace):
+        durations = trace.durations()
+        samples = self._samples.get(trace.menu)
+        if samples is None:
+            samples = self._samples[trace.menu] = deque(maxlen=self._history)
+            self._counts[trace.menu] = [0] * (len(self.buckets) + 1)
+        samples.append(durations)
+        self._counts[trace.menu][int(np.searchsorted(self.buckets, durations['total'], side='right'))] += 1
+        self.stats['completed'] += 1
+    
+    def _expire(self, now):
+        """Drop traces whose frame never reached the panel"""
+        keep = [t for t in self._open if now - t.isr < self.timeout]
+        self.stats['expired'] += len(self._open) - len(keep)
+        self._open = keep
+    
+    def get_stats(self):
+        """Per menu: p50/p95/p99 of the total and of each stage over recent traces, plus histogram counts"""
+        with self._lock:
+            samples = {menu: list(s) for menu, s in self._samples.items()}
+            counts = {menu: list(c) for menu, c in self._counts.items()}
+            stats = dict(self.stats)
+        labels = [f"<{edge}ms" for edge in self.buckets] + [f">={self.buckets[-1]}ms"]
+        menus = {}
+        for menu, recent in samples.items():
+            entry = {'count': len(recent)}
+            for field in STAGES + ('total',):
+                p50, p95, p99 = np.percentile([d[field] for d in recent], (50, 95, 99))
+                entry[field] = {'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
+            entry['max_ms'] = max(d['total'] for d in recent)
+            entry['histogram'] = dict(zip(labels, counts[menu]))
+            menus[MENU_NAMES.get(menu, str(menu))] = entry
+        stats['menus'] = menus
+        return stats
+    
+    def dump(self, path=LATENCY_LOG):
+        """Write the current stats as JSON, e.g. into logs/ for comparing builds in the field"""
+        stats = self.get_stats()
+        stats['time'] = time.time()
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(stats, f, indent=2)
+        except OSError as e:
+            logging.error(f"Latency dump error: {e}")
+            return False
+        logging.info(f"Latency stats written to {path}")
+        return True
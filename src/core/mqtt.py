@@ -10,6 +10,11 @@ class MQTTManager:
         self.state = state
         self.data_logger = data_logger
         self.client = None
+        # Called with every energy reading, on the MQTT thread
+        self.energy_listeners = []
+        # Latest reading that arrived in standby, formatted on wake
+        self._deferred = None
+        self._lock = threading.Lock()
     
     def init_client(self):
         """Initialize MQTT client"""
@@ -82,7 +87,23 @@ class MQTTManager:
         # Log data
         self.data_logger.log_data(data)
         
-        # Update metrics
+        # Nobody looks at the screen in standby; only the latest reading matters on wake
+        with self._lock:
+            if not self.state.awake.is_set():
+                self._deferred = data
+                return
+            self._deferred = None
+        self._update_metrics(data)
+    
+    def catch_up(self):
+        """Wake listener: format the reading deferred in standby"""
+        with self._lock:
+            data, self._deferred = self._deferred, None
+        if data is not None:
+            self._update_metrics(data)
+    
+    def _update_metrics(self, data):
+        """Format the metric strings and notify the energy listeners"""
         self.state.energy_metrics.clear()
         self.state.energy_metrics.append(f"Voltage: {data.get('voltage', 'N/A')} V")
         
@@ -101,6 +122,12 @@ class MQTTManager:
             current = phase.get("current", 0.0)
             power = phase.get("power", 0.0)
             self.state.energy_metrics.append(f"Phase {idx+1}: {power:.2f}W / {current:.2f}A")
+        
+        for listener in self.energy_listeners:
+            try:
+                listener(data)
+            except Exception as e:
+                logging.error(f"Energy listener error: {e}")
     
     def _handle_wifi_credentials(self, data):
         """Handle WiFi credentials from ESP32"""
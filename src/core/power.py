@@ -0,0 +1,123 @@
+"""Active and standby power states"""
+import logging
+import time
+from config.constants import (STANDBY_FADE, BACKLIGHT_MAX, BACKLIGHT_IDLE, BACKLIGHT_IDLE_TIMEOUT,
+                              BACKLIGHT_RAMP)
+
+ACTIVE = "active"
+DIMMING = "dimming"
+STANDBY = "standby"
+
+class PowerManager:
+    """Moves the device between active and standby.
+    
+    While active, the backlight dims to idle_level after idle_timeout
+    without touches and ramps back up on the next one.
+    
+    Entering standby clears the state's awake event right away, so the
+    device metrics loop, the update checker and MQTT string formatting
+    pause, then fades the backlight out and puts the panel to sleep with
+    its last frame kept encoded. Waking pushes that frame as soon as the
+    panel is out of sleep, restores the backlight, lets the wake listeners
+    catch up on skipped work and redraws the current screen in the
+    background.
+    """
+    def __init__(self, display, state, backlight, fade=STANDBY_FADE, idle_level=BACKLIGHT_IDLE,
+                 idle_timeout=BACKLIGHT_IDLE_TIMEOUT, ramp=BACKLIGHT_RAMP):
+        self.display = display
+        self.state = state
+        self.backlight = backlight
+        self.fade = fade
+        self.idle_level = idle_level
+        self.idle_timeout = idle_timeout
+        self.ramp = ramp
+        self.mode = ACTIVE
+        self.dimmed = False
+        self.wake_listeners = []
+        self._then = None
+        self._since = None
+        self.stats = {
+            'dims': 0,
+            'standbys': 0,
+            'wakes': 0,
+            'standby_s': 0.0,
+        }
+    
+    @property
+    def active(self):
+        return self.mode == ACTIVE
+    
+    def idle(self, idle_for):
+        """Dim the backlight once idle for idle_timeout"""
+        if self.mode == ACTIVE and not self.dimmed and idle_for >= self.idle_timeout:
+            self.dimmed = True
+            self.stats['dims'] += 1
+            self.backlight.fade(self.idle_level, self.fade)
+    
+    def dim_in(self, idle_for):
+        """Seconds until idle() dims, or None if it has nothing left to do"""
+        if self.mode != ACTIVE or self.dimmed:
+            return None
+        return self.idle_timeout - idle_for
+    
+    def activity(self):
+        """A touch while active: back to full brightness"""
+        if self.mode == ACTIVE and self.dimmed:
+            self.dimmed = False
+            self.backlight.fade(BACKLIGHT_MAX, self.ramp)
+    
+    def enter_standby(self, then=None):
+        """Quiesce background work and fade out; then() runs once the panel sleeps"""
+        if self.mode != ACTIVE:
+            return
+        self.mode = DIMMING
+        self.state.awake.clear()
+        self._then = then
+        self.backlight.fade(0, self.fade, done=self._sleep)
+    
+    def _sleep(self):
+        """End of the fade: the panel goes to sleep"""
+        if self.mode != DIMMING:
+            return
+        self.mode = STANDBY
+        self.state.is_standby = True
+        self.display.sleep()
+        self._since = time.time()
+        self.stats['standbys'] += 1
+        if self._then is not None:
+            self._then()
+    
+    def wake(self):
+        """Back to active; returns False if already active"""
+        if self.mode == ACTIVE:
+            return False
+        was = self.mode
+        self.mode = ACTIVE
+        self.dimmed = False
+        self.state.is_standby = False
+        if was == STANDBY:
+            self.stats['wakes'] += 1
+            self.stats['standby_s'] += time.time() - self._since
+            # Light up only once the panel shows the kept frame again
+            self.backlight.set(0)
+            self.display.wake(on_ready=lambda: self.backlight.set(BACKLIGHT_MAX))
+        else:
+            # Caught during the fade; the panel never slept
+            self.backlight.set(BACKLIGHT_MAX)
+        
+        self.state.awake.set()
+        for listener in self.wake_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logging.error(f"Wake listener error: {e}")
+        self.display.scheduler.invalidate()
+        return True
+    
+    def get_stats(self):
+        """Current mode plus standby counters"""
+        stats = dict(self.stats)
+        stats['mode'] = self.mode
+        stats['dimmed'] = self.dimmed
+        stats['backlight'] = self.backlight.level
+        return stats
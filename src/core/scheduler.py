@@ -0,0 +1,244 @@
+"""Frame scheduler: coalesced redraws at a target frame rate"""
+import logging
+import threading
+import time
+from collections import deque, namedtuple
+from config.constants import TARGET_FPS, FRAME_HISTORY
+from core.timers import TimerWheel
+
+SCREEN = "screen"
+# Keys of user-facing actions in progress; a long press cancels them
+TOAST = "toast"
+LOADING = "loading"
+TASK = "task"
+ACTIONS = (TOAST, LOADING, TASK)
+
+FrameRecord = namedtuple("FrameRecord", ["time", "name", "render_ms", "serial"])
+
+class Task:
+    """Blocking work running on a worker thread; its result comes back on the main loop"""
+    def __init__(self, work, done, key):
+        self.work = work
+        self.done = done
+        self.key = key
+        self.cancelled = False
+
+class FrameScheduler:
+    """Runs redraw requests at most once per frame tick.
+    
+    Requests are keyed, so asking for the same redraw again before the tick
+    only replaces it. Animations run every tick until they return a falsy
+    value or are cancelled. With nothing requested a tick does no work, and
+    idle_timeout() tells the main loop how long it may sleep.
+    
+    Delayed callbacks go on a timer wheel and blocking work on worker threads
+    (start_task), so nothing on the main loop has to sleep. Both run their
+    callbacks from run(), on the main loop, and both can be cancelled by key.
+    """
+    def __init__(self, display, fps=TARGET_FPS, history=FRAME_HISTORY):
+        self.display = display
+        self.frame_time = 1.0 / fps
+        self.render_screen = None
+        # Called when work is added, so a loop blocked waiting for input can run it
+        self.wake = None
+        self._requests = {}
+        self._animations = {}
+        self._tasks = {}
+        self.timers = TimerWheel()
+        self._lock = threading.Lock()
+        self._next_tick = 0.0
+        self._records = deque(maxlen=history)
+        self.stats = {
+            'ticks': 0,
+            'renders': 0,
+            'requests': 0,
+            'coalesced': 0,
+            'overruns': 0,
+        }
+    
+    def request(self, fn, key=None):
+        """Ask for fn to run on the next tick; a pending request with the same key is replaced"""
+        key = fn if key is None else key
+        with self._lock:
+            self.stats['requests'] += 1
+            if key in self._requests:
+                self.stats['coalesced'] += 1
+            self._requests[key] = fn
+        if self.wake is not None:
+            self.wake()
+    
+    def invalidate(self):
+        """Redraw the current screen on the next tick"""
+        if self.render_screen is not None:
+            self.request(self.render_screen, SCREEN)
+    
+    def animate(self, fn, key=None):
+        """Run fn every tick while it returns True"""
+        with self._lock:
+            self._animations[fn if key is None else key] = fn
+        if self.wake is not None:
+            self.wake()
+    
+    def after(self, delay, fn, key=None):
+        """Run fn on the main loop after delay seconds; a pending timer with the same key is replaced"""
+        timer = self.timers.schedule(delay, fn, key)
+        if self.wake is not None:
+            self.wake()
+        return timer
+    
+    def start_task(self, work, done=None, key=TASK):
+        """Run work() on a worker thread, then done(result) on the main loop.
+        
+        Starting another task with the same key, or cancel(key), drops the
+        pending result; the returned Task's cancelled flag tells the work too.
+        """
+        task = Task(work, done, key)
+        with self._lock:
+            previous = self._tasks.get(key)
+            if previous is not None:
+                previous.cancelled = True
+            self._tasks[key] = task
+        threading.Thread(target=self._run_task, args=(task,), name=f"task-{key}", daemon=True).start()
+        return task
+    
+    def _run_task(self, task):
+        try:
+            result = task.work()
+        except Exception as e:
+            logging.error(f"Task error: {e}")
+            result = None
+        if not task.cancelled:
+            self.request(lambda: self._finish_task(task, result), (TASK, task.key))
+    
+    def _finish_task(self, task, result):
+        """Hand a task's result to its callback, unless it was cancelled meanwhile"""
+        with self._lock:
+            if self._tasks.get(task.key) is task:
+                del self._tasks[task.key]
+        if not task.cancelled and task.done is not None:
+            task.done(result)
+    
+    def cancel(self, key):
+        """Drop a pending request, animation, timer or task result"""
+        with self._lock:
+            self._requests.pop(key, None)
+            self._animations.pop(key, None)
+            self._requests.pop((TASK, key), None)
+            task = self._tasks.pop(key, None)
+            if task is not None:
+                task.cancelled = True
+        self.timers.cancel(key)
+    
+    def cancel_actions(self):
+        """Cancel toasts, loading animations and background tasks in progress"""
+        for key in ACTIONS:
+            self.cancel(key)
+    
+    @property
+    def busy(self):
+        """Whether a toast, loading animation or background task is in progress"""
+        return bool(self._tasks) or LOADING in self._animations or any(key in self.timers for key in ACTIONS)
+    
+    @property
+    def pending(self):
+        return bool(self._requests or self._animations)
+    
+    def idle_timeout(self, max_wait, now=None):
+        """Seconds the loop may sleep before the next tick or timer is due (max_wait when idle)"""
+        now = time.time() if now is None else now
+        wait = max_wait
+        if self.pending:
+            wait = min(max(self._next_tick - now, 0.0), wait)
+        deadline = self.timers.next_deadline()
+        if deadline is not None:
+            wait = min(max(deadline - now, 0.0), wait)
+        return wait
+    
+    def run(self, now=None):
+        """Fire due timers, then run due work if a tick is due; returns True if anything ran"""
+        now = time.time() if now is None else now
+        fired = self.timers.run(now)
+        if not self.pending or now < self._next_tick:
+            return fired > 0
+        
+        with self._lock:
+            requests = list(self._requests.items())
+            self._requests.clear()
+            animations = list(self._animations.items())
+        
+        self.stats['ticks'] += 1
+        for key, fn in requests:
+            self._render(key, fn)
+        for key, fn in animations:
+            # A request this tick may have cancelled or replaced the animation
+            if self._animations.get(key) is not fn:
+                continue
+            if not self._render(key, fn, record_idle=False):
+                with self._lock:
+                    if self._animations.get(key) is fn:
+                        del self._animations[key]
+        
+        if time.time() - now > self.frame_time:
+            self.stats['overruns'] += 1
+        # Stay on the frame grid; after an idle gap or a late tick restart it instead of bursting
+        self._next_tick += self.frame_time
+        if self._next_tick <= now:
+            self._next_tick = now + self.frame_time
+        return True
+    
+    def _render(self, key, fn, record_idle=True):
+        """Run one piece of work and record its duration and the frame it produced"""
+        serial = self.display.frame_serial
+        start = time.perf_counter()
+        try:
+            if key == SCREEN:
+                # The screen redraw is what a gesture's latency trace waits for
+                with self.display.latency.attribute():
+                    result = fn()
+            else:
+                result = fn()
+        except Exception as e:
+            logging.error(f"Render error: {e}")
+            result = False
+        render_ms = (time.perf_counter() - start) * 1000.0
+        self.stats['renders'] += 1
+        produced = self.display.frame_serial if self.display.frame_serial != serial else None
+        if produced is not None or record_idle:
+            self._records.append(FrameRecord(time.time(), self._name(key, fn), render_ms, produced))
+        return result
+    
+    @staticmethod
+    def _name(key, fn):
+        """Readable name of a piece of work"""
+        if isinstance(key, str):
+            return key
+        return getattr(fn, '__qualname__', repr(fn))
+    
+    def frames(self, count=None):
+        """Recent work with render, encode and push times joined per frame (oldest first)"""
+        pushes = {push.serial: push for push in self.display.get_push_times()}
+        records = list(self._records)
+        if count is not None:
+            records = records[-count:]
+        frames = []
+        for record in records:
+            push = pushes.get(record.serial)
+            frames.append({
+                'time': record.time,
+                'name': record.name,
+                'render_ms': record.render_ms,
+                'encode_ms': push.encode_ms if push else None,
+                'push_ms': push.push_ms if push else None,
+                'bytes': push.bytes if push else 0,
+            })
+        return frames
+    
+    def get_stats(self):
+        """Counters plus mean durations over the recorded frames"""
+        stats = dict(self.stats)
+        frames = self.frames()
+        for field in ('render_ms', 'encode_ms', 'push_ms'):
+            values = [f[field] for f in frames if f[field] is not None]
+            stats[f'mean_{field}'] = sum(values) / len(values) if values else 0.0
+        stats['target_fps'] = 1.0 / self.frame_time
+        return stats
@@ -0,0 +1,119 @@
+"""Timer wheel for delayed callbacks on the main loop"""
+import logging
+import math
+import threading
+import time
+from config.constants import TIMER_RESOLUTION, TIMER_SLOTS
+
+class Timer:
+    """A scheduled callback; cancel() keeps it from firing"""
+    __slots__ = ("deadline", "tick", "fn", "key", "cancelled")
+    
+    def __init__(self, deadline, tick, fn, key):
+        self.deadline = deadline
+        self.tick = tick
+        self.fn = fn
+        self.key = key
+        self.cancelled = False
+    
+    def cancel(self):
+        self.cancelled = True
+
+class TimerWheel:
+    """Hashed timing wheel: timers live in the slot of their deadline tick.
+    
+    Scheduling and cancelling are O(1); run() only visits the slots of the
+    ticks that passed since the last call. A timer further away than one turn
+    of the wheel stays in its slot until its own tick comes round. Keyed
+    timers replace a pending timer with the same key.
+    """
+    def __init__(self, resolution=TIMER_RESOLUTION, slots=TIMER_SLOTS):
+        self.resolution = resolution
+        self._slots = [[] for _ in range(slots)]
+        self._keys = {}
+        self._active = set()
+        self._tick = math.floor(time.time() / resolution)
+        self._lock = threading.Lock()
+    
+    def schedule(self, delay, fn, key=None, now=None):
+        """Call fn after delay seconds; returns the Timer"""
+        now = time.time() if now is None else now
+        deadline = now + max(delay, 0.0)
+        with self._lock:
+            # Never before the deadline, and never in a tick run() already visited
+            tick = max(math.ceil(deadline / self.resolution), self._tick + 1)
+            timer = Timer(deadline, tick, fn, key)
+            if key is not None:
+                previous = self._keys.pop(key, None)
+                if previous is not None:
+                    previous.cancel()
+                    self._active.discard(previous)
+                self._keys[key] = timer
+            self._slots[tick % len(self._slots)].append(timer)
+            self._active.add(timer)
+        return timer
+    
+    def cancel(self, key):
+        """Cancel a pending timer by key or Timer; returns True if one was pending"""
+        with self._lock:
+            timer = key if isinstance(key, Timer) else self._keys.get(key)
+            if timer is None or timer not in self._active:
+                return False
+            timer.cancel()
+            self._active.discard(timer)
+            if self._keys.get(timer.key) is timer:
+                del self._keys[timer.key]
+            return True
+    
+    def __contains__(self, key):
+        return key in self._keys
+    
+    def __len__(self):
+        return len(self._active)
+    
+    def next_deadline(self):
+        """When run() will next have a timer to fire (its tick boundary), or None"""
+        with self._lock:
+            tick = min((t.tick for t in self._active), default=None)
+        return None if tick is None else tick * self.resolution
+    
+    def run(self, now=None):
+        """Fire every timer whose tick has passed; returns how many fired"""
+        now = time.time() if now is None else now
+        current = math.floor(now / self.resolution)
+        due = []
+        with self._lock:
+            if current <= self._tick:
+                return 0
+            slots = len(self._slots)
+            # After a long gap one pass over the wheel covers every slot
+            ticks = range(self._tick + 1, current + 1) if current - self._tick < slots else \
+                range(current - slots + 1, current + 1)
+            for tick in ticks:
+                slot = self._slots[tick % slots]
+                if not slot:
+                    continue
+                keep = []
+                for timer in slot:
+                    if timer.cancelled:
+                        continue
+                    if timer.tick <= current:
+                        due.append(timer)
+                    else:
+                        keep.append(timer)
+                slot[:] = keep
+            self._tick = current
+            for timer in due:
+                self._active.discard(timer)
+                if timer.key is not None and self._keys.get(timer.key) is timer:
+                    del self._keys[timer.key]
+        
+        due.sort(key=lambda t: t.deadline)
+        for timer in due:
+            if timer.cancelled:
+                continue
+            try:
+                timer.fn()
+            except Exception as e:
+                logging.error(f"Timer error: {e}")
+        return len(due)
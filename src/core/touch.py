@@ -2,12 +2,23 @@
 import time
 import logging
 from config.constants import *
+from core.gesture_queue import GestureQueue
+from core.touch_reader import TouchReader
 
 class TouchHandler:
     def __init__(self, touch, state, menu_handler):
         self.touch = touch
         self.state = state
         self.menu_handler = menu_handler
+        self.scheduler = menu_handler.scheduler
+        # Gestures from the interrupt, filtered and coalesced
+        self.events = GestureQueue()
+        self.scheduler.wake = self.events.wake
+        # Controller reads happen here, off the interrupt thread
+        self.reader = TouchReader(touch, self.post_gesture)
+        self.latency = menu_handler.display.latency
+        self.power = menu_handler.power
+        self._ignore_until = 0.0
         
     def init(self):
         """Initialize touch"""
@@ -16,68 +27,100 @@ class TouchHandler:
     
     def setup_callback(self, callback):
         """Setup interrupt callback"""
+        self.reader.start()
         self.touch.int_irq(TP_INT, callback)
     
+    def post_gesture(self, gesture, timestamp=None, point=None):
+        """Queue a gesture read in the touch interrupt, with its touch point; safe from any thread"""
+        if gesture:
+            self.events.put(gesture, timestamp, point)
+    
+    def get_stats(self):
+        """Gesture queue counters (received, duplicates, coalesced, dropped, depth) and controller reads"""
+        stats = self.events.get_stats()
+        stats['reader'] = self.reader.get_stats()
+        return stats
+    
+    def _next_timeout(self, current_time):
+        """How long the loop may block: until the next frame tick, the idle dim or the standby deadline"""
+        if self.state.is_standby:
+            # Nothing is due in standby; block until a touch
+            return None
+        wait = self.scheduler.idle_timeout(TOUCH_IDLE_TIMEOUT, current_time)
+        if self.power.active:
+            idle_for = current_time - self.state.last_activity_time
+            wait = min(wait, STANDBY_TIMEOUT - idle_for)
+            dim_in = self.power.dim_in(idle_for)
+            if dim_in is not None:
+                wait = min(wait, dim_in)
+        return max(0.0, wait)
+    
     def handle_loop(self):
         """Main touch handling loop"""
         while True:
+            event = self.events.get(self._next_timeout(time.time()))
             current_time = time.time()
-            gesture = self.touch.Gestures
             
-            # Handle standby
-            if self.state.is_standby:
-                if gesture != 0:
+            # Handle standby; while the backlight fades out a touch only wakes too
+            if not self.power.active:
+                if event is not None:
                     self._wake_from_standby(current_time)
-                time.sleep(0.08)
+                elif not self.state.is_standby:
+                    self.scheduler.run()
                 continue
             
-            # Handle scrolling animations
-            self._handle_scrolling_animations(current_time)
-            
-            # Handle long press
-            if gesture == GESTURE_LONG_PRESS:
-                self._handle_long_press(current_time)
-                continue
+            if event is not None and event.time < self._ignore_until:
+                event = None
             
-            # Handle other gestures
-            if gesture != 0:
-                self._handle_gesture(gesture, current_time)
+            if event is not None:
+                self.power.activity()
+                trace = self.latency.begin(event, self.state.current_menu, current_time)
+                # Handle long press
+                if event.gesture == GESTURE_LONG_PRESS:
+                    with self.latency.attribute():
+                        self._handle_long_press(current_time)
+                    self.latency.handled(trace)
+                    continue
+                
+                # Handle other gestures
+                with self.latency.attribute():
+                    routed = self._handle_gesture(event)
+                if routed:
+                    self.latency.handled(trace)
+                else:
+                    self.latency.discard(trace)
             
             # Check for standby
             self._check_standby(current_time)
             
-            time.sleep(0.04)
+            # Re-render the frame atlas after a theme or update badge change
+            self.menu_handler.atlas.refresh()
+            
+            # Render the likely next screens while nothing else is due
+            self.menu_handler.prefetcher.refresh()
+            
+            # Draw whatever was invalidated, at most once per frame tick
+            self.scheduler.run()
     
     def _wake_from_standby(self, current_time):
         """Wake from standby mode"""
         logging.info("Waking from standby")
-        self.state.is_standby = False
         self.state.last_activity_time = current_time
-        self.touch.Stop_Sleep()
-        self.touch.Set_Mode(0)
-        self.menu_handler.display.wake()
-        self.touch.Gestures = 0
-        time.sleep(0.3)
-        self.menu_handler.render_current_menu()
+        if self.state.is_standby:
+            # The touch controller went to standby with the panel
+            self.touch.Stop_Sleep()
+            self.touch.Set_Mode(0)
+        # Shows the last frame right away and redraws it in the background
+        self.power.wake()
+        # Interrupts from the waking touch are not gestures
+        self._ignore_until = current_time + WAKE_GUARD
         self.state.last_gesture = None
         self.state.last_gesture_time = current_time
     
-    def _handle_scrolling_animations(self, current_time):
-        """Handle scrolling animations"""
-        if self.touch.Gestures == 0:
-            if current_time - self.state.last_render_time > RENDER_THROTTLE:
-                if self.state.in_saved_networks_mode:
-                    self.menu_handler.wifi_menu.render_saved_networks()
-                    self.state.last_render_time = current_time
-                elif self.state.current_menu == MENU_CONFIRM_NETWORK:
-                    self.menu_handler.wifi_menu.render_network_confirmation()
-                    self.state.last_render_time = current_time
-    
     def _handle_long_press(self, current_time):
         """Handle long press gesture"""
-        self.touch.Gestures = 0
         logging.info("Long press - returning to main menu")
-        time.sleep(0.2)
+        self.scheduler.cancel_actions()
         self.state.current_menu = MENU_MAIN
         self.state.selected_option = 0
         self.state.current_page = 0
@@ -86,35 +129,34 @@ class TouchHandler:
         self.state.last_gesture = None
         self.state.last_gesture_time = current_time
         self.state.last_activity_time = current_time
-        time.sleep(0.3)
     
-    def _handle_gesture(self, gesture, current_time):
-        """Handle regular gestures"""
-        is_new = (gesture != self.state.last_gesture) or \
-                 (current_time - self.state.last_gesture_time > GESTURE_DEBOUNCE)
-        
-        if is_new:
-            self.touch.Gestures = 0
-            logging.info(f"Gesture: {gesture}")
-            self.state.last_gesture = gesture
-            self.state.last_gesture_time = current_time
-            self.state.last_activity_time = current_time
-            
-            # Route to appropriate handler
-            self.menu_handler.handle_gesture(gesture)
-            
-            self.touch.Gestures = 0
-            time.sleep(0.15)
+    def _handle_gesture(self, event):
+        """Handle regular gestures; repeats were already filtered by the queue. False if ignored"""
+        if event.count > 1:
+            logging.info(f"Gesture: {event.gesture} x{event.count}")
         else:
-            self.touch.Gestures = 0
+            logging.info(f"Gesture: {event.gesture}")
+        self.state.last_gesture = event.gesture
+        self.state.last_gesture_time = event.time
+        self.state.last_activity_time = time.time()
+        
+        # Route to appropriate handler
+        return self.menu_handler.handle_gesture(event.gesture, event.count, event.point)
     
     def _check_standby(self, current_time):
-        """Check if should enter standby"""
-        if not self.state.is_standby and \
-           (current_time - self.state.last_activity_time > STANDBY_TIMEOUT):
+        """Check if should dim the backlight or enter standby"""
+        if self.scheduler.busy:
+            # A task or toast owns the screen; the idle clock starts when it is done
+            self.state.last_activity_time = current_time
+            return
+        idle_for = current_time - self.state.last_activity_time
+        if self.power.active and idle_for > STANDBY_TIMEOUT:
             logging.info("Entering standby")
-            self.state.is_standby = True
-            self.menu_handler.display.sleep()
-            self.touch.Configure_Standby(timeout=5)
-            self.touch.Gestures = 0
-            self.state.last_gesture = None
\ No newline at end of file
+            self.power.enter_standby(then=self._touch_standby)
+        else:
+            self.power.idle(idle_for)
+    
+    def _touch_standby(self):
+        """The panel is asleep; let the touch controller doze too"""
+        self.touch.Configure_Standby(timeout=5)
+        self.state.last_gesture = None
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Touch controller reads off the interrupt thread"""
+import logging
+import threading
+import time
+from collections import deque
+
+class TouchReader:
+    """Reads the touch controller on its own thread so the interrupt never blocks.
+    
+    interrupt() only stamps the time and wakes the reader, which takes one
+    burst sample per interrupt and hands its gesture and touch point to
+    on_gesture with the interrupt's timestamp. Menus use that point rather
+    than reading the controller again, so the bus has a single reader and
+    a tap's coordinates are the ones read with it.
+    """
+    def __init__(self, touch, on_gesture):
+        self.touch = touch
+        self.on_gesture = on_gesture
+        self._interrupts = deque()
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {
+            'interrupts': 0,
+            'reads': 0,
+            'errors': 0,
+            'read_ms': 0.0,
+            'max_read_ms': 0.0,
+        }
+    
+    def start(self):
+        """Start the reader thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="touch-reader", daemon=True)
+            self._thread.start()
+    
+    def interrupt(self, timestamp=None):
+        """Touch interrupt: note when it happened and wake the reader; never blocks"""
+        self._interrupts.append(time.time() if timestamp is None else timestamp)
+        self._wake.set()
+    
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            while self._interrupts:
+                timestamp = self._interrupts.popleft()
+                self.stats['interrupts'] += 1
+                sample = self._read(timestamp)
+                if sample is not None and sample.gesture:
+                    self.on_gesture(sample.gesture, timestamp, (sample.x, sample.y))
+    
+    def _read(self, timestamp):
+        start = time.perf_counter()
+        try:
+            sample = self.touch.read_sample(timestamp)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logging.error(f"Touch read error: {e}")
+            return None
+        elapsed = (time.perf_counter() - start) * 1000.0
+        self.stats['reads'] += 1
+        self.stats['read_ms'] += elapsed
+        self.stats['max_read_ms'] = max(self.stats['max_read_ms'], elapsed)
+        return sample
+    
+    def get_stats(self):
+        """Read counters with the mean read time"""
+        stats = dict(self.stats)
+        stats['avg_read_ms'] = stats.pop('read_ms') / stats['reads'] if stats['reads'] else 0.0
+        return stats
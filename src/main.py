@@ -9,7 +9,7 @@ import signal
 import logging
 import threading
 import time
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 # Add parent directory to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,10 +22,14 @@ from lib import LCD_1inch28, Touch_1inch28
 # Import application modules
 from config.constants import *
 from config.themes import THEMES
+from config.fonts import get_font
+from config.glyphs import prewarm_glyphs
 from utils.state import state
 from utils.helpers import get_device_metrics, update_device_metrics_loop
 from core.display import DisplayManager
 from core.touch import TouchHandler
+from core.backlight import Backlight
+from core.power import PowerManager
 from core.mqtt import MQTTManager
 from services.wifi_service import WiFiService
 from services.data_logger import DataLogger
@@ -37,17 +41,18 @@ from ui.menus.confirmation import ConfirmationMenu
 from services.energy_analyzer import EnergyAnalyzer
 from services.update_checker import UpdateChecker
 from ui.menus.update_menu import UpdateMenu
+from ui.atlas import FrameAtlas
+from ui.prefetch import Prefetcher
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 
 class MenuHandler:
     """Central menu handler"""
-    def __init__(self, display, state, wifi_service, touch_device, energy_analyzer=None, update_checker=None):
+    def __init__(self, display, state, wifi_service, energy_analyzer=None, update_checker=None):
         self.display = display
         self.state = state
         self.wifi_service = wifi_service
-        self.touch_device = touch_device
         self.energy_analyzer = energy_analyzer
         self.update_checker = update_checker
 
@@ -59,12 +64,33 @@ class MenuHandler:
         self.confirmation_menu = ConfirmationMenu(display, state)
         self.update_menu = UpdateMenu(display, state, update_checker)
 
+        # Pre-rendered frames for the menus with a fixed set of states
+        self.atlas = FrameAtlas(display, state)
+        self.atlas.register(self.main_menu, self.wifi_menu, self.confirmation_menu)
+        # Frames one gesture away from the current screen, rendered while idle
+        self.prefetcher = Prefetcher(display, state, self.prefetch_states)
+
+        # Invalidated screens are redrawn by the frame scheduler
+        self.scheduler = display.scheduler
+        self.scheduler.render_screen = self.render_current_menu
+        
+        # Standby and wake, with the backlight fade
+        self.power = PowerManager(display, state, Backlight(display))
+
     def render_current_menu(self):
         """Render current menu"""
+        if self.scheduler.busy:
+            # A task, toast or loading animation owns the screen; it redraws the menu when done
+            return
         if self.state.current_menu == MENU_MAIN:
             self.main_menu.render()
         elif self.state.current_menu == MENU_WIFI:
-            self.wifi_menu.render()
+            if self.state.in_saved_networks_mode:
+                self.wifi_menu.render_saved_networks()
+            elif self.state.in_wifi_qr_mode:
+                self.wifi_menu.render_qr_code()
+            else:
+                self.wifi_menu.render()
         elif self.state.current_menu == MENU_MQTT:
             self.energy_menu.render()
         elif self.state.current_menu == MENU_METRICS:
@@ -76,39 +102,74 @@ class MenuHandler:
         elif self.state.current_menu == MENU_UPDATE:
             self.update_menu.render()
 
+    def prefetch_states(self):
+        """Likely next frames, following the menu graph from the current screen"""
+        if self.state.current_menu == MENU_MAIN:
+            # A tap opens the selected item; WiFi and shutdown are in the frame atlas already
+            target = self.main_menu.target(self.state.selected_option)
+            if target == MENU_MQTT:
+                return [self.energy_menu.view_state(0, self.state.chart_mode, self.state.current_page)]
+            if target == MENU_METRICS:
+                return [self.device_menu.page_state(self.state.current_page)]
+        elif self.state.current_menu == MENU_MQTT:
+            return self.energy_menu.prefetch_states()
+        elif self.state.current_menu == MENU_METRICS:
+            return self.device_menu.prefetch_states()
+        return []
+
     def render_main_menu(self):
         """Render main menu"""
         self.state.current_menu = MENU_MAIN
         self.main_menu.render()
     
-    def handle_gesture(self, gesture):
-        """Route gesture to appropriate menu"""
+    def handle_gesture(self, gesture, count=1, point=None):
+        """Route gesture to appropriate menu; count > 1 repeats a coalesced scroll.
+        
+        point is the (x, y) the touch reader read with the gesture, for taps on buttons.
+        
+        Returns False if the gesture was ignored.
+        """
+        # A toast, loading animation or background task owns the screen until it ends
+        if self.scheduler.busy:
+            logging.info(f"Ignoring gesture {gesture} while busy")
+            return False
+        
+        for _ in range(count):
+            next_menu = self._route_gesture(gesture, point)
+            if next_menu is not None:
+                break
+        self.prefetcher.invalidate()
+        
+        if next_menu is not None:
+            self.state.current_menu = next_menu
+            self.scheduler.invalidate()
+        return True
+    
+    def _route_gesture(self, gesture, point=None):
+        """Hand one gesture to the current menu; returns the menu to switch to, if any"""
         next_menu = None
         
         if self.state.current_menu == MENU_MAIN:
-            next_menu = self.main_menu.handle_gesture(gesture, self.touch_device)
+            next_menu = self.main_menu.handle_gesture(gesture, point)
         elif self.state.current_menu == MENU_WIFI:
-            next_menu = self.wifi_menu.handle_gesture(gesture, self.touch_device)
+            next_menu = self.wifi_menu.handle_gesture(gesture, point)
         elif self.state.current_menu == MENU_MQTT:
-            next_menu = self.energy_menu.handle_gesture(gesture, self.touch_device)  
+            next_menu = self.energy_menu.handle_gesture(gesture, point)  
         elif self.state.current_menu == MENU_METRICS:
-            next_menu = self.device_menu.handle_gesture(gesture, self.touch_device) 
+            next_menu = self.device_menu.handle_gesture(gesture, point) 
         elif self.state.current_menu == MENU_CONFIRM_SHUTDOWN:
-            next_menu = self.confirmation_menu.handle_shutdown_gesture(gesture, self.touch_device)
+            next_menu = self.confirmation_menu.handle_shutdown_gesture(gesture, point)
         elif self.state.current_menu == MENU_CONFIRM_NETWORK:
-            next_menu = self.wifi_menu.handle_confirmation_gesture(gesture, self.touch_device)
+            next_menu = self.wifi_menu.handle_confirmation_gesture(gesture, point)
         elif self.state.current_menu == MENU_UPDATE:
-            next_menu = self.update_menu.handle_gesture(gesture, self.touch_device)
-
-        if next_menu is not None:
-            self.state.current_menu = next_menu
-            time.sleep(0.1)
-            self.render_current_menu()
+            next_menu = self.update_menu.handle_gesture(gesture, point)
+        return next_menu
 
 def interrupt_callback(TP_INT=TP_INT):
-    """Touch interrupt callback"""
-    touch.Gestures = touch.Touch_Read_Byte(0x01)
-    state.last_activity_time = time.time()
+    """Touch interrupt callback: hand the touch to the reader thread without touching I2C"""
+    now = time.time()
+    touch_handler.reader.interrupt(now)
+    state.last_activity_time = now
 
 def show_startup_screen(display):
     """Show startup logo"""
@@ -116,8 +177,7 @@ def show_startup_screen(display):
     image = logo.copy()
     draw = ImageDraw.Draw(image)
     
-    from PIL import ImageFont
-    font = ImageFont.truetype("../Font/DejaVuSans.ttf", 24)
+    font = get_font(24)
     
     draw.text((65, 80), 'Welcome', fill='white', font=font)
     draw.text((110, 110), 'To', fill='white', font=font)
@@ -125,11 +185,18 @@ def show_startup_screen(display):
     display.show_image(image)
     time.sleep(5)
 
+def dump_latency_stats():
+    """Write the touch-to-photon histograms to the logs directory, then again after an interval"""
+    disp.latency.dump()
+    disp.scheduler.after(LATENCY_DUMP_INTERVAL, dump_latency_stats, key="latency-dump")
+
 def cleanup_and_exit(signum, frame):
     """Cleanup on exit"""
     logging.info("Exiting program...")
     try:
         if disp and hasattr(disp, 'disp'):
+            disp.shutdown()
+            disp.latency.dump()
             disp.disp.module_exit()
     except Exception as e:
         logging.error(f"Cleanup error: {e}")
@@ -139,6 +206,7 @@ def cleanup_and_exit(signum, frame):
 # Global hardware instances
 disp = None
 touch = None
+touch_handler = None
 menu_handler = None
 
 if __name__ == "__main__":
@@ -149,7 +217,7 @@ if __name__ == "__main__":
         
         # Initialize hardware
         logging.info("Initializing hardware...")
-        disp_hw = LCD_1inch28.LCD_1inch28()
+        disp_hw = LCD_1inch28.LCD_1inch28(bl_hw_pwm=BACKLIGHT_HW_PWM)
         touch_hw = Touch_1inch28.Touch_1inch28()
         
         # Initialize display manager
@@ -170,7 +238,9 @@ if __name__ == "__main__":
         mqtt_manager = MQTTManager(state, data_logger)
 
         # Initialize menu handler
-        menu_handler = MenuHandler(disp, state, wifi_service, touch, energy_analyzer, update_checker)
+        menu_handler = MenuHandler(disp, state, wifi_service, energy_analyzer, update_checker)
+        mqtt_manager.energy_listeners.append(menu_handler.energy_menu.add_live_sample)
+        menu_handler.power.wake_listeners.append(mqtt_manager.catch_up)
         
         # Initialize touch handler
         touch_handler = TouchHandler(touch, state, menu_handler)
@@ -184,11 +254,18 @@ if __name__ == "__main__":
         logging.info("Starting MQTT...")
         mqtt_manager.init_client()
         
+        # Rasterize the UI glyphs before anything draws text
+        prewarm_glyphs()
+        
+        # Fill the frame atlas while the startup screen is up
+        menu_handler.atlas.refresh()
+        
         # Show startup screen
         show_startup_screen(disp)
         
         # Render main menu
         menu_handler.render_main_menu()
+        disp.scheduler.after(LATENCY_DUMP_INTERVAL, dump_latency_stats, key="latency-dump")
         
         # Start touch handling loop
         logging.info("Starting main loop...")
@@ -197,10 +274,12 @@ if __name__ == "__main__":
     except IOError as e:
         logging.error(f"IOError: {e}")
         if disp:
+            disp.shutdown()
             disp.disp.module_exit()
     except KeyboardInterrupt:
         cleanup_and_exit(signal.SIGINT, None)
     except Exception as e:
         logging.error(f"Unexpected error: {e}", exc_info=True)
         if disp:
+            disp.shutdown()
             disp.disp.module_exit()
\ No newline at end of file
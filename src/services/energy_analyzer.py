@@ -5,6 +5,7 @@ import os
 from datetime import datetime, timedelta
 from collections import deque
 import logging
+import numpy as np
 
 class EnergyAnalyzer:
     def __init__(self, log_file="../logs/mqtt_data_log.txt"):
@@ -14,6 +15,9 @@ class EnergyAnalyzer:
         self.last_data_time = None
         self.last_5min_save = 0
         self.last_30min_save = 0
+        # Bumped whenever a history changes; power columns are rebuilt lazily after that
+        self._revision = 0
+        self._series = {}
         
         # Load historical data from log file
         self._load_historical_data()
@@ -101,6 +105,7 @@ class EnergyAnalyzer:
                 'phases': data.get('phases', [])
             })
             self.last_5min_save = current_time
+            self._revision += 1
         
         # Save to 7d history (every 30 minutes)
         if current_time - self.last_30min_save >= 1800:  # 30 minutes
@@ -112,6 +117,12 @@ class EnergyAnalyzer:
                 'energyTotal': data.get('energyTotal', 0)
             })
             self.last_30min_save = current_time
+            self._revision += 1
+    
+    @property
+    def revision(self):
+        """Bumped whenever a sample is added to the 24h or 7d history"""
+        return self._revision
     
     def get_time_since_last_data(self):
         """Get formatted time since last data received"""
@@ -176,4 +187,23 @@ class EnergyAnalyzer:
     
     def get_chart_data_7d(self):
         """Get data formatted for 7d chart"""
-        return list(self.data_7d)
\ No newline at end of file
+        return list(self.data_7d)
+    
+    def get_power_series_24h(self):
+        """Total power of the 24h history as a read-only float array"""
+        return self._power_series("24h", self.data_24h)
+    
+    def get_power_series_7d(self):
+        """Total power of the 7d history as a read-only float array"""
+        return self._power_series("7d", self.data_7d)
+    
+    def _power_series(self, name, history):
+        """Cached totalPower column of a history, rebuilt only after new samples"""
+        cached = self._series.get(name)
+        if cached is not None and cached[0] == self._revision:
+            return cached[1]
+        samples = list(history)
+        powers = np.fromiter((d['totalPower'] for d in samples), dtype=float, count=len(samples))
+        powers.flags.writeable = False
+        self._series[name] = (self._revision, powers)
+        return powers
\ No newline at end of file
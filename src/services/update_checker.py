@@ -151,9 +151,10 @@ class UpdateChecker:
         time.sleep(60)
         
         while True:
+            # A check due in standby runs on wake
+            self.state.awake.wait()
             try:
-                if not self.state.is_standby:
-                    self.check_for_updates()
+                self.check_for_updates()
             except Exception as e:
                 logging.error(f"Update check error: {e}")
             
@@ -1,4 +1,5 @@
 """UI module for rendering and menu management"""
 from .renderer import BaseRenderer
+from .atlas import FrameAtlas
 
-__all__ = ['BaseRenderer']
\ No newline at end of file
+__all__ = ['BaseRenderer', 'FrameAtlas']
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""Pre-rendered frames for menus with a small, finite set of states"""
+import logging
+import threading
+import time
+
+class FrameAtlas:
+    """Renders every static state of the registered menus ahead of time.
+    
+    Frames live in the display's layer cache together with their RGB565
+    encoding, so showing one is a straight SPI push. A menu takes part by
+    providing atlas_states(), which returns (key, draw_fn) pairs for the
+    active theme and current state, using the same keys its render uses.
+    """
+    def __init__(self, display, state):
+        self.display = display
+        self.state = state
+        self.menus = []
+        self._inputs = None
+        self._theme = None
+        self._keys = set()
+        self._pending = False
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def register(self, *menus):
+        """Add menus that provide atlas_states()"""
+        self.menus.extend(menus)
+    
+    def _current_inputs(self):
+        """Everything besides the menu selections that the atlas frames depend on"""
+        return (self.state.active_theme.name, self.state.update_available)
+    
+    def refresh(self):
+        """Re-render the atlas in the background if its inputs changed; cheap otherwise"""
+        inputs = self._current_inputs()
+        with self._lock:
+            if inputs == self._inputs:
+                return False
+            self._inputs = inputs
+        self.prewarm()
+        return True
+    
+    def prewarm(self):
+        """Render all states on a background thread (coalesces repeated requests)"""
+        with self._lock:
+            self._pending = True
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        """Worker loop, runs until no prewarm is pending"""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                self._pending = False
+            try:
+                self._prewarm()
+            except Exception as e:
+                logging.error(f"Frame atlas error: {e}")
+    
+    def _prewarm(self):
+        """Compose and encode every state for the active theme"""
+        start = time.time()
+        theme = self.state.active_theme
+        states = [entry for menu in self.menus for entry in menu.atlas_states()]
+        keys = {key for key, _ in states}
+        
+        # Drop frames whose inputs are gone, e.g. the old update badge state
+        if self._theme is not None:
+            self.display.invalidate_layers(self._theme, self._keys - keys)
+        self._theme = theme
+        self._keys = keys
+        
+        for key, draw_fn in states:
+            self.display.prepare_layer(theme, key, draw_fn)
+            if self.state.active_theme is not theme:
+                # Theme switched mid-way; this frame may mix both, the next refresh redoes it
+                self.display.invalidate_layers(theme, [key])
+                return
+        
+        logging.info(f"Frame atlas: {len(states)} frames ready in {(time.time() - start) * 1000:.0f} ms")
@@ -1,4 +1,7 @@
 """UI components"""
 from .charts import ChartRenderer
+from .marquee import Marquee
+from .widgets import Widget, Label, TextList, ButtonPair, StatusBar, Chart, WidgetScreen
 
-__all__ = ['ChartRenderer']
\ No newline at end of file
+__all__ = ['ChartRenderer', 'Marquee', 'Widget', 'Label', 'TextList', 'ButtonPair',
+           'StatusBar', 'Chart', 'WidgetScreen']
\ No newline at end of file
@@ -1,7 +1,8 @@
 """Chart rendering components"""
-from PIL import ImageDraw
+import numpy as np
 from ui.renderer import BaseRenderer
 from config.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from config.glyphs import TextDraw
 
 class ChartRenderer(BaseRenderer):
     def __init__(self, display, state):
@@ -13,8 +14,8 @@ class ChartRenderer(BaseRenderer):
             self.render_message("No phase data")
             return
         
-        image = self.get_background()
-        draw = ImageDraw.Draw(image)
+        image = self.get_layer("power_chart", self._draw_power_chrome)
+        draw = TextDraw(image)
         
         bar_width = 30
         spacing = 20
@@ -25,9 +26,6 @@ class ChartRenderer(BaseRenderer):
         total_width = len(phases) * (bar_width + spacing) - spacing
         start_x = (SCREEN_WIDTH - total_width) // 2
         
-        # Title
-        draw.text((60, 10), "Power(W)", fill=self.get_text_color(), font=self.get_font())
-        
         bar_colors = ["red", "green", "blue"]
         
         for i, phase in enumerate(phases):
@@ -43,19 +41,22 @@ class ChartRenderer(BaseRenderer):
             
             # Draw power value
             value_text = f"{int(power)}"
-            value_w = self.get_font().getlength(value_text)
+            value_w = self.text_width(value_text)
             draw.text((x + (bar_width - value_w) // 2, y - 18), value_text, 
                      fill=self.get_text_color(), font=self.get_font())
             
             # Phase label
             label = f"P{i+1}"
-            label_w = self.get_font().getlength(label)
+            label_w = self.text_width(label)
             draw.text((x + (bar_width - label_w) // 2, origin_y + 5), label, 
                      fill=self.get_text_color(), font=self.get_font())
         
         self.display.show_image(image)
-        del draw
-        del image
+        self.release(image)
+    
+    def _draw_power_chrome(self, draw):
+        """Draw the power chart title"""
+        draw.text((60, 10), "Power(W)", fill=self.get_text_color(), font=self.get_font())
     
     def draw_line_chart(self, values):
         """Draw line chart for current data"""
@@ -63,8 +64,8 @@ class ChartRenderer(BaseRenderer):
             self.render_message("No data for line chart")
             return
         
-        image = self.get_background()
-        draw = ImageDraw.Draw(image)
+        image = self.get_layer("line_chart", self._draw_line_chrome)
+        draw = TextDraw(image)
         
         max_val = max(values)
         min_val = min(values)
@@ -76,13 +77,6 @@ class ChartRenderer(BaseRenderer):
         
         scale = chart_height / (max_val - min_val + 1e-3)
         
-        # Title
-        draw.text((60, 10), "Current per Phase", fill=self.get_text_color(), font=self.get_font())
-        
-        # Axes
-        draw.line([(chart_left, chart_top), (chart_left, chart_bottom)], fill="gray")
-        draw.line([(chart_left, chart_bottom), (chart_left + chart_width, chart_bottom)], fill="gray")
-        
         colors = ["red", "green", "blue"]
         
         for i in range(1, len(values)):
@@ -94,29 +88,43 @@ class ChartRenderer(BaseRenderer):
             draw.line([x1, y1, x2, y2], fill=colors[i % len(colors)], width=2)
         
         self.display.show_image(image)
-        del draw
-        del image
+        self.release(image)
+    
+    def _draw_line_chrome(self, draw):
+        """Draw the line chart title and axes"""
+        chart_top, chart_bottom = 40, 180
+        chart_left, chart_width = 20, 200
+        
+        # Title
+        draw.text((60, 10), "Current per Phase", fill=self.get_text_color(), font=self.get_font())
+        
+        # Axes
+        draw.line([(chart_left, chart_top), (chart_left, chart_bottom)], fill="gray")
+        draw.line([(chart_left, chart_bottom), (chart_left + chart_width, chart_bottom)], fill="gray")
     
     def draw_trend_chart(self, draw, data, y_start, height, label):
         """Draw compact trend chart for historical data"""
-        if not data or len(data) < 2:
+        if data is None or len(data) < 2:
             # Draw "No data" message on the draw object
             no_data_font = self.get_font(14)
             draw.text((20, y_start + 20), f"No {label} data yet", 
                      fill="gray", font=no_data_font)
             return
         
-        # Extract power values
-        powers = [d.get('totalPower', 0) for d in data]
+        # Power column, as given by the analyzer or pulled from the samples
+        if isinstance(data, np.ndarray):
+            powers = data
+        else:
+            powers = np.fromiter((d.get('totalPower', 0) for d in data), dtype=float, count=len(data))
         
-        if not any(powers):  # All zeros
+        if not powers.any():  # All zeros
             no_data_font = self.get_font(14)
             draw.text((20, y_start + 20), f"All {label} values are zero", 
                      fill="gray", font=no_data_font)
             return
         
-        max_power = max(powers)
-        min_power = min([p for p in powers if p > 0] + [0])
+        max_power = powers.max()
+        min_power = np.min(powers[powers > 0], initial=0)
         
         chart_width = 200
         chart_left = 20
@@ -132,17 +140,35 @@ class ChartRenderer(BaseRenderer):
         draw.line([(chart_left, y_start), (chart_left, chart_bottom)], fill="gray")
         draw.line([(chart_left, chart_bottom), (chart_right, chart_bottom)], fill="gray")
         
-        # Draw trend line
-        points = []
-        for i, power in enumerate(powers):
-            x = chart_left + (i * chart_width / (len(powers) - 1))
-            y = chart_bottom - int((power - min_power) * scale)
-            points.append((x, y))
-        
-        # Draw line segments
-        for i in range(len(points) - 1):
-            draw.line([points[i], points[i + 1]], fill=self.get_selected_color(), width=2)
+        # Draw trend line as one polyline, at most four points per pixel column
+        x = chart_left + np.arange(len(powers)) * (chart_width / (len(powers) - 1))
+        y = chart_bottom - ((powers - min_power) * scale).astype(int)
+        if len(powers) > chart_width:
+            points = self._column_envelope(x, y, chart_left)
+        else:
+            points = np.column_stack((x, y))
+        draw.line(points.ravel().tolist(), fill=self.get_selected_color(), width=2, joint="curve")
         
         # Label
         label_font = self.get_font(12)
-        draw.text((chart_left, y_start - 15), label, fill="gray", font=label_font)
\ No newline at end of file
+        draw.text((chart_left, y_start - 15), label, fill="gray", font=label_font)
+    
+    def _column_envelope(self, x, y, left):
+        """Reduce a dense line to first, extremes and last point of each pixel column.
+        
+        Drawing these in order covers exactly the pixels the full line would, so
+        the cost depends on the chart width rather than the number of samples.
+        """
+        columns = np.floor(x - left).astype(int)
+        starts = np.flatnonzero(np.diff(columns, prepend=-1))
+        ends = np.append(starts[1:], len(y)) - 1
+        points = np.empty((len(starts), 4, 2))
+        points[:, :, 0] = (left + columns[starts])[:, None]
+        points[:, 0, 1] = y[starts]
+        points[:, 1, 1] = np.minimum.reduceat(y, starts)
+        points[:, 2, 1] = np.maximum.reduceat(y, starts)
+        points[:, 3, 1] = y[ends]
+        points = points.reshape(-1, 2)
+        # Repeated points only add joints
+        keep = np.append(True, np.any(np.diff(points, axis=0) != 0, axis=1))
+        return points[keep]
\ No newline at end of file
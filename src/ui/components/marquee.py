@@ -0,0 +1,71 @@
+"""Sprite-based marquee for text wider than its slot"""
+import math
+import time
+from PIL import Image, ImageDraw
+from config.constants import MARQUEE_SPEED, MARQUEE_GAP
+from config.fonts import text_length
+
+class Marquee:
+    """Scrolls one line of text pixel by pixel inside a fixed band of the screen.
+    
+    The looping text strip is rasterized once into an alpha sprite. Each tick
+    crops the visible window out of it, tints it over a saved copy of the band's
+    backdrop and pushes just that band, so nothing else is redrawn or sent.
+    Ticks are paced by the caller (the frame scheduler).
+    """
+    def __init__(self, text, font, fill, x, y, width, speed=MARQUEE_SPEED, gap=MARQUEE_GAP):
+        self.text = text
+        self.fill = fill
+        self.x = x
+        self.y = y
+        self.width = width
+        self.speed = speed
+        ascent, descent = font.getmetrics()
+        self.height = ascent + descent
+        
+        # One period is the text plus the gap before it repeats
+        self.period = max(1, round(text_length(font, text + gap)))
+        copies = math.ceil(width / self.period) + 1
+        self._sprite = Image.new("L", (self.period * copies, self.height), 0)
+        draw = ImageDraw.Draw(self._sprite)
+        for i in range(copies):
+            draw.text((i * self.period, 0), text + gap, fill=255, font=font)
+        
+        self._backdrop = None
+        self._start = None
+        self._shown_offset = None
+    
+    @property
+    def box(self):
+        """Screen rectangle (x0, y0, x1, y1) the marquee draws into"""
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+    
+    def attach(self, image, now=None):
+        """Remember the band's backdrop from a composed frame and draw the first step onto it"""
+        now = time.time() if now is None else now
+        self._backdrop = image.crop(self.box)
+        self._start = now
+        self._shown_offset = 0
+        image.paste(self._compose(0), (self.x, self.y))
+    
+    def offset(self, now):
+        """Scroll position in pixels at the given time"""
+        return int((now - self._start) * self.speed) % self.period
+    
+    def _compose(self, offset):
+        """Backdrop band with the sprite window at offset tinted on top"""
+        band = self._backdrop.copy()
+        mask = self._sprite.crop((offset, 0, offset + self.width, self.height))
+        band.paste(self.fill, (0, 0, self.width, self.height), mask)
+        return band
+    
+    def tick(self, display, now=None):
+        """Push the band for the current time if the position moved"""
+        if self._backdrop is None:
+            return False
+        now = time.time() if now is None else now
+        offset = self.offset(now)
+        if offset == self._shown_offset:
+            return False
+        self._shown_offset = offset
+        return display.show_region(self._compose(offset), self.x, self.y)
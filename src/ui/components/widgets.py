@@ -0,0 +1,393 @@
+"""Retained-mode widgets that track their own bounds and dirty state"""
+import copy
+import math
+from abc import ABC, abstractmethod
+import threading
+import numpy as np
+from PIL import Image
+from config.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from config.fonts import text_bbox, text_length
+from config.glyphs import TextDraw
+
+def union(a, b):
+    """Smallest box containing both boxes (either may be None)"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+def intersects(a, b):
+    """Whether two (x0, y0, x1, y1) boxes overlap"""
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+def clip(box):
+    """Round a box outwards to whole pixels and clip it to the screen; None if empty"""
+    x0 = max(0, math.floor(box[0]))
+    y0 = max(0, math.floor(box[1]))
+    x1 = min(SCREEN_WIDTH, math.ceil(box[2]))
+    y1 = min(SCREEN_HEIGHT, math.ceil(box[3]))
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return (x0, y0, x1, y1)
+
+def differs(old, new):
+    """Whether a property value changed; arrays compare by content"""
+    if old is new:
+        return False
+    if isinstance(old, np.ndarray) or isinstance(new, np.ndarray):
+        return not np.array_equal(old, new)
+    return old != new
+
+def painter(widgets):
+    """Draw function that paints the widgets in order, for frames composed off screen"""
+    widgets = list(widgets)
+    
+    def paint(draw):
+        for widget in widgets:
+            widget.paint(draw)
+    return paint
+
+def _text_box(x, y, text, font):
+    """Screen box of text drawn at (x, y), padded a pixel for antialiasing"""
+    left, top, right, bottom = text_bbox(font, text)
+    return (x + left - 1, y + top - 1, x + right + 1, y + bottom + 1)
+
+class Widget(ABC):
+    """Base widget; subclasses implement measure() and paint(draw).
+    
+    Properties change through update(), which marks the widget dirty and
+    remembers where it was last drawn so that area can be cleared.
+    """
+    def __init__(self):
+        self.visible = True
+        self.dirty = True
+        self._bounds = None
+        self._drawn = None
+    
+    def update(self, **props):
+        """Set properties; returns True (and invalidates) if any value changed"""
+        changed = False
+        for name, value in props.items():
+            if differs(getattr(self, name), value):
+                setattr(self, name, value)
+                changed = True
+        if changed:
+            self.invalidate()
+        return changed
+    
+    def invalidate(self):
+        """Force a redraw"""
+        self.dirty = True
+        self._bounds = None
+    
+    def replace(self, **props):
+        """Copy with some properties changed, for painting another state off screen"""
+        widget = copy.copy(self)
+        widget.__dict__.update(props)
+        widget.invalidate()
+        return widget
+    
+    @property
+    def bounds(self):
+        """Box the widget covers when visible"""
+        if self._bounds is None:
+            self._bounds = self.measure()
+        return self._bounds
+    
+    def damage(self):
+        """Area to restore before redrawing: where it was plus where it will be"""
+        return union(self._drawn, self.bounds if self.visible else None)
+    
+    def draw(self, draw):
+        """Paint the widget and mark it clean"""
+        if self.visible:
+            self.paint(draw)
+            self._drawn = self.bounds
+        else:
+            self._drawn = None
+        self.dirty = False
+    
+    @abstractmethod
+    def measure(self):
+        """Box the widget covers, as (x0, y0, x1, y1)"""
+    
+    @abstractmethod
+    def paint(self, draw):
+        """Draw the widget with its current properties"""
+
+class Label(Widget):
+    """Single line of text"""
+    def __init__(self, x, y, text, font, fill):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.text = text
+        self.font = font
+        self.fill = fill
+    
+    def measure(self):
+        return _text_box(self.x, self.y, self.text, self.font)
+    
+    def paint(self, draw):
+        draw.text((self.x, self.y), self.text, fill=self.fill, font=self.font)
+
+class TextList(Widget):
+    """Lines of text stacked at a fixed spacing"""
+    def __init__(self, x, y, font, fill, spacing, lines=()):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.font = font
+        self.fill = fill
+        self.spacing = spacing
+        self.lines = tuple(lines)
+    
+    def measure(self):
+        box = None
+        for i, line in enumerate(self.lines):
+            box = union(box, _text_box(self.x, self.y + i * self.spacing, line, self.font))
+        return box or (self.x, self.y, self.x, self.y)
+    
+    def paint(self, draw):
+        y = self.y
+        for line in self.lines:
+            draw.text((self.x, y), line, fill=self.fill, font=self.font)
+            y += self.spacing
+
+class ButtonPair(Widget):
+    """Two outlined buttons side by side, centered horizontally"""
+    def __init__(self, y, font, left, right, left_color, right_color,
+                 box_w=90, box_h=50, spacing=20, text_dy=10):
+        super().__init__()
+        self.y = y
+        self.font = font
+        self.left = left
+        self.right = right
+        self.left_color = left_color
+        self.right_color = right_color
+        self.box_w = box_w
+        self.box_h = box_h
+        self.spacing = spacing
+        self.text_dy = text_dy
+    
+    def boxes(self):
+        """(left box, right box) as [x0, y0, x1, y1], also used for hit testing"""
+        start_x = (SCREEN_WIDTH - (2 * self.box_w + self.spacing)) // 2
+        right_x = start_x + self.box_w + self.spacing
+        return ([start_x, self.y, start_x + self.box_w, self.y + self.box_h],
+                [right_x, self.y, right_x + self.box_w, self.y + self.box_h])
+    
+    def hit(self, x, y):
+        """0 for the left button, 1 for the right one, None elsewhere"""
+        for i, (x0, y0, x1, y1) in enumerate(self.boxes()):
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                return i
+        return None
+    
+    def measure(self):
+        left, right = self.boxes()
+        return (left[0], left[1], right[2] + 1, right[3] + 1)
+    
+    def paint(self, draw):
+        for box, text, color in zip(self.boxes(), (self.left, self.right),
+                                    (self.left_color, self.right_color)):
+            draw.rectangle(box, outline=color, width=2)
+            text_w = text_length(self.font, text)
+            draw.text((box[0] + (self.box_w - text_w) // 2, box[1] + self.text_dy), text,
+                     fill=color, font=self.font)
+
+class StatusBar(Widget):
+    """Left-anchored and right-aligned status texts; either may be empty"""
+    def __init__(self, font, left_xy, right_y, right_margin=10,
+                 left_text="", right_text="", left_fill="white", right_fill="gray"):
+        super().__init__()
+        self.font = font
+        self.left_xy = left_xy
+        self.right_y = right_y
+        self.right_margin = right_margin
+        self.left_text = left_text
+        self.right_text = right_text
+        self.left_fill = left_fill
+        self.right_fill = right_fill
+    
+    def _right_x(self):
+        return SCREEN_WIDTH - text_length(self.font, self.right_text) - self.right_margin
+    
+    def measure(self):
+        box = None
+        if self.left_text:
+            box = _text_box(*self.left_xy, self.left_text, self.font)
+        if self.right_text:
+            box = union(box, _text_box(self._right_x(), self.right_y, self.right_text, self.font))
+        return box or (0, 0, 0, 0)
+    
+    def paint(self, draw):
+        if self.left_text:
+            draw.text(self.left_xy, self.left_text, fill=self.left_fill, font=self.font)
+        if self.right_text:
+            draw.text((self._right_x(), self.right_y), self.right_text,
+                     fill=self.right_fill, font=self.font)
+
+class Chart(Widget):
+    """Fixed area painted by a chart function from its data"""
+    def __init__(self, box, paint_fn, data=None):
+        super().__init__()
+        self.box = box
+        self.paint_fn = paint_fn
+        self.data = data
+    
+    def measure(self):
+        return self.box
+    
+    def paint(self, draw):
+        self.paint_fn(draw, self.data)
+
+class StripChart(Widget):
+    """Live chart scrolling one pixel column per sample.
+    
+    Samples go into a ring buffer as wide as the plot, so appending is O(1) and
+    safe from other threads. Painting unrolls the ring oldest-first, scales it
+    to the current peak and blits each series as a single mask, so a redraw
+    costs the same however long the feed has been running.
+    """
+    def __init__(self, box, colors, font=None, label_fill="gray", unit=""):
+        super().__init__()
+        self.box = box
+        self.colors = list(colors)
+        self.font = font
+        self.label_fill = label_fill
+        self.unit = unit
+        width, height = box[2] - box[0], box[3] - box[1]
+        self._samples = np.full((len(self.colors), width), np.nan)
+        self._head = 0
+        self._rows = np.arange(height)[:, None]
+        self._lock = threading.Lock()
+    
+    def append(self, values):
+        """Add one sample per series (missing series are left blank) and mark the chart dirty"""
+        with self._lock:
+            column = self._samples[:, self._head]
+            column[:] = np.nan
+            count = min(len(values), len(column))
+            column[:count] = values[:count]
+            self._head = (self._head + 1) % self._samples.shape[1]
+            self.invalidate()
+    
+    def clear(self):
+        """Drop all samples"""
+        with self._lock:
+            self._samples[:] = np.nan
+            self._head = 0
+            self.invalidate()
+    
+    def measure(self):
+        return self.box
+    
+    def paint(self, draw):
+        with self._lock:
+            samples = np.roll(self._samples, -self._head, axis=1)
+        height = self._rows.shape[0]
+        finite = np.isfinite(samples)
+        if not finite.any():
+            return
+        peak = max(float(samples[finite].max()), 1e-3)
+        y = np.where(finite, (height - 1) - np.clip(samples, 0, None) / peak * (height - 1), np.nan)
+        
+        # Each column spans from the previous sample to its own, which joins the line up
+        previous = np.concatenate((y[:, :1], y[:, :-1]), axis=1)
+        previous = np.where(np.isfinite(previous), previous, y)
+        low = np.rint(np.fmin(previous, y))
+        high = np.rint(np.fmax(previous, y))
+        for i, color in enumerate(self.colors):
+            if not finite[i].any():
+                continue
+            mask = (self._rows >= low[i]) & (self._rows <= high[i])
+            # Two pixels wide, like the other charts' lines
+            mask[:, 1:] |= mask[:, :-1].copy()
+            # A 1-bit mask is a plain copy rather than an alpha blend
+            draw.bitmap(self.box[:2], Image.fromarray(mask), fill=color)
+        
+        if self.font is not None:
+            draw.text((self.box[0] + 4, self.box[1]), f"{peak:.0f}{self.unit}",
+                     fill=self.label_fill, font=self.font)
+
+class WidgetScreen:
+    """A screen of widgets over a cached static layer.
+    
+    Static widgets are baked into the theme's layer cache. The first render,
+    or any render after another frame replaced ours, composes the full screen;
+    later renders restore and repaint only what the dirty widgets damaged and
+    push just those areas. Nothing dirty means no work at all.
+    """
+    def __init__(self, renderer, key, widgets=(), static=()):
+        self.renderer = renderer
+        self.key = key
+        self.widgets = list(widgets)
+        self.static = list(static)
+        self._base = None
+        self._image = None
+        self._theme = None
+        self._serial = None
+    
+    def draw_static(self, draw):
+        """Paint the static widgets into the cached layer"""
+        for widget in self.static:
+            widget.draw(draw)
+    
+    def render(self):
+        """Show the screen, redrawing only what changed since our last frame"""
+        display = self.renderer.display
+        theme = self.renderer.state.active_theme.name
+        if not self.widgets:
+            self.renderer.show_layer(self.key, self.draw_static)
+        elif self._image is None or theme != self._theme or display.frame_serial != self._serial:
+            self._compose(theme)
+        else:
+            self._repaint()
+        self._serial = display.frame_serial
+    
+    def _compose(self, theme):
+        """Full redraw on top of a fresh copy of the static layer"""
+        if self._base is not None:
+            self.renderer.release(self._base)
+        self._base = self.renderer.get_layer(self.key, self.draw_static)
+        if self._image is None:
+            self._image = self._base.copy()
+        else:
+            self._image.paste(self._base)
+        self._theme = theme
+        draw = TextDraw(self._image)
+        for widget in self.widgets:
+            widget.draw(draw)
+        self.renderer.display.show_image(self._image)
+    
+    def _repaint(self):
+        """Restore and repaint the damaged areas of the dirty widgets"""
+        dirty = [w for w in self.widgets if w.dirty]
+        if not dirty:
+            return
+        
+        boxes = [box for box in (clip(w.damage()) for w in dirty) if box]
+        redraw = set(dirty)
+        # Overlapping widgets are repainted whole, so grow the areas until they cover them
+        grown = True
+        while grown:
+            grown = False
+            for widget in self.widgets:
+                if widget in redraw or not widget.visible:
+                    continue
+                box = clip(widget.bounds)
+                if box and any(intersects(box, b) for b in boxes):
+                    redraw.add(widget)
+                    boxes.append(box)
+                    grown = True
+        
+        for box in boxes:
+            self._image.paste(self._base.crop(box), box[:2])
+        draw = TextDraw(self._image)
+        for widget in self.widgets:
+            if widget in redraw:
+                widget.draw(draw)
+        if boxes:
+            self.renderer.display.show_regions(self._image, boxes)
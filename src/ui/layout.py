@@ -0,0 +1,42 @@
+"""Cached text layout"""
+from collections import namedtuple
+from functools import lru_cache
+from config.fonts import text_length, text_bbox
+
+TextLayout = namedtuple("TextLayout", ["lines", "widths"])
+
+@lru_cache(maxsize=256)
+def layout_text(text, font, max_width):
+    """Greedy word wrap of text into lines no wider than max_width.
+    
+    Word widths come from the measurement cache and are summed as the line
+    grows, so a miss costs one lookup per word instead of re-measuring the
+    whole prefix. Kerning makes the sum differ from the real width by a pixel
+    or so, therefore candidates close to the limit are measured exactly.
+    """
+    space_w = text_length(font, " ")
+    slack = max(2, font.size // 4)
+    lines = []
+    current = []
+    current_w = 0.0  # width of the current line including its trailing space
+    
+    for word in text.split():
+        test_w = current_w + text_length(font, word) + space_w
+        if abs(test_w - max_width) <= slack:
+            bbox = text_bbox(font, " ".join(current + [word]) + " ")
+            fits = bbox[2] - bbox[0] <= max_width
+        else:
+            fits = test_w <= max_width
+        
+        if fits:
+            current.append(word)
+            current_w = test_w
+        else:
+            lines.append(" ".join(current))
+            current = [word]
+            current_w = text_length(font, word) + space_w
+    
+    if current:
+        lines.append(" ".join(current))
+    
+    return TextLayout(tuple(lines), tuple(text_length(font, line) for line in lines))
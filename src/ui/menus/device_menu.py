@@ -1,11 +1,16 @@
 """Device metrics menu"""
-from PIL import ImageDraw
 from ui.renderer import BaseRenderer
+from ui.components.widgets import Label, TextList, WidgetScreen, painter
 from config.constants import *
 
 class DeviceMenu(BaseRenderer):
     def __init__(self, display, state):
         super().__init__(display, state)
+        arrow_x = SCREEN_WIDTH // 2 - 10
+        self.arrows = [Label(arrow_x, 10, "▲", self.get_font(), None),
+                       Label(arrow_x, SCREEN_HEIGHT - 30, "▼", self.get_font(), None)]
+        self.page = TextList(20, 80, self.get_font(), None, 30)
+        self.screen = WidgetScreen(self, "device_arrows", widgets=[self.page], static=self.arrows)
     
     def render(self):
         """Render device metrics"""
@@ -13,26 +18,34 @@ class DeviceMenu(BaseRenderer):
             self.render_message("Loading device metrics...")
             return
         
-        image = self.get_background()
-        draw = ImageDraw.Draw(image)
-        
-        text = self.state.device_metrics_pages[self.state.current_page % len(self.state.device_metrics_pages)]
-        lines = self.wrap_text(text, self.get_font(), max_width=220)
-        y = 80
-        for line in lines:
-            draw.text((20, y), line, fill=self.get_text_color(), font=self.get_font())
-            y += 30
-        
-        # Centered scroll arrows
-        arrow_x = SCREEN_WIDTH // 2 - 10
-        draw.text((arrow_x, 10), "▲", fill=self.get_selected_color(), font=self.get_font())
-        draw.text((arrow_x, SCREEN_HEIGHT - 30), "▼", fill=self.get_selected_color(), font=self.get_font())
-        
-        self.display.show_image(image)
-        del draw
-        del image
+        lines = self._page_lines(self.state.current_page)
+        if self.show_prefetched(("device", lines)):
+            return
+        for arrow in self.arrows:
+            arrow.update(fill=self.get_selected_color())
+        self.page.update(lines=lines, fill=self.get_text_color())
+        self.screen.render()
+    
+    def _page_lines(self, page):
+        """Wrapped lines of a metrics page"""
+        pages = self.state.device_metrics_pages
+        return tuple(self.wrap_text(pages[page % len(pages)], self.get_font(), max_width=220))
+    
+    def page_state(self, page):
+        """Prefetch key and draw function of a metrics page, or None while loading"""
+        if not self.state.device_metrics_pages:
+            return None
+        lines = self._page_lines(page)
+        arrows = [arrow.replace(fill=self.get_selected_color()) for arrow in self.arrows]
+        text = self.page.replace(lines=lines, fill=self.get_text_color())
+        return ("device", lines), painter(arrows + [text])
+    
+    def prefetch_states(self):
+        """Pages an UP or DOWN swipe leads to"""
+        page = self.state.current_page
+        return [self.page_state(page - 1), self.page_state(page + 1)]
     
-    def handle_gesture(self, gesture, touch_device=None):
+    def handle_gesture(self, gesture, point=None):
         """Handle device menu gestures"""
         if not self.state.device_metrics_pages:
             if gesture in [GESTURE_LEFT, GESTURE_LONG_PRESS]:
@@ -41,10 +54,10 @@ class DeviceMenu(BaseRenderer):
         
         if gesture == GESTURE_UP:
             self.state.current_page = (self.state.current_page - 1) % len(self.state.device_metrics_pages)
-            self.render()
+            self.invalidate()
         elif gesture == GESTURE_DOWN:
             self.state.current_page = (self.state.current_page + 1) % len(self.state.device_metrics_pages)
-            self.render()
+            self.invalidate()
         elif gesture in [GESTURE_LEFT, GESTURE_LONG_PRESS]:
             self.state.current_page = 0
             return MENU_MAIN
@@ -1,8 +1,9 @@
 """Energy/MQTT menu rendering and handling"""
-from PIL import ImageDraw
 from ui.renderer import BaseRenderer
 from ui.components.charts import ChartRenderer
+from ui.components.widgets import Label, TextList, StatusBar, Chart, StripChart, WidgetScreen, painter, clip
 from config.constants import *
+from config.glyphs import TextDraw
 
 class EnergyMenu(BaseRenderer):
     def __init__(self, display, state, energy_analyzer=None):
@@ -10,15 +11,98 @@ class EnergyMenu(BaseRenderer):
         self.chart_renderer = ChartRenderer(display, state)
         self.energy_analyzer = energy_analyzer
         self.view_mode = 0  # 0=current, 1=24h, 2=7d
+        # View (mode, chart mode, page) and frame serial of the last render, to tell
+        # view changes and returns from other screens from redraws in place
+        self._shown_view = None
+        self._shown_serial = None
+        self._build_widgets()
+    
+    def _build_widgets(self):
+        """Create the retained widgets of the text, 24h and 7d views"""
+        # Current view: static arrow and view label, live status bar and metrics text
+        view_font = self.get_font(14)
+        self.current_arrow = Label(SCREEN_WIDTH // 2 - 10, SCREEN_HEIGHT - 30, "▼", self.get_font(), None)
+        self.current_label = Label(SCREEN_WIDTH - self.text_width("Current", view_font) - 10,
+                                   SCREEN_HEIGHT - 25, "Current", view_font, "gray")
+        self.status_bar = StatusBar(self.get_font(14), (25, 25), 10)
+        self.metrics_text = TextList(20, 50, self.get_font(), None, 30)  # Lower to make room for status bar
+        self.current_screen = WidgetScreen(self, "energy_current",
+                                           widgets=[self.status_bar, self.metrics_text],
+                                           static=[self.current_arrow, self.current_label])
+        
+        # History views: static title, stats lines and a mini trend chart below them
+        self.title_24h = self._title_label("Last 24 Hours")
+        self.stats_24h = TextList(20, 40, self.get_font(18), None, 28)
+        self.chart_24h = self._trend_chart(40 + 5 * 28 + 10, 80, "24h")
+        self.screen_24h = WidgetScreen(self, "energy_24h", widgets=[self.stats_24h, self.chart_24h],
+                                       static=[self.title_24h])
+        
+        self.title_7d = self._title_label("Last 7 Days")
+        self.stats_7d = TextList(20, 40, self.get_font(18), None, 30)
+        self.chart_7d = self._trend_chart(40 + 4 * 30 + 10, 70, "7d")
+        self.screen_7d = WidgetScreen(self, "energy_7d", widgets=[self.stats_7d, self.chart_7d],
+                                      static=[self.title_7d])
+        
+        # Live view: per-phase power scrolling in as MQTT readings arrive
+        self.live_title = self._title_label("Live Power(W)")
+        self.live_axes = Chart((20, 40, 221, 181), self._draw_live_axes)
+        self.live_chart = StripChart((21, 40, 221, 180), ["red", "green", "blue"],
+                                     font=self.get_font(12))
+        self.live_screen = WidgetScreen(self, "energy_live", widgets=[self.live_chart],
+                                        static=[self.live_title, self.live_axes])
+    
+    def _title_label(self, title):
+        """Centered view title"""
+        title_font = self.get_font(20)
+        title_w = self.text_width(title, title_font)
+        return Label((SCREEN_WIDTH - title_w) // 2, 10, title, title_font, None)
+    
+    def _trend_chart(self, y_start, height, label):
+        """Mini trend chart widget covering the chart, its label and the no-data notes"""
+        box = (18, y_start - 16, SCREEN_WIDTH, y_start + height + 3)
+        return Chart(box, lambda draw, data: self.chart_renderer.draw_trend_chart(draw, data, y_start, height, label))
+    
+    def _draw_live_axes(self, draw, data):
+        """Axes of the live chart, in the style of the line chart"""
+        draw.line([(20, 40), (20, 180)], fill="gray")
+        draw.line([(20, 180), (220, 180)], fill="gray")
+    
+    def add_live_sample(self, data):
+        """MQTT listener: scroll the phase powers into the live chart, redrawing it if shown"""
+        self.live_chart.append([p.get("power", 0) for p in data.get("phases", [])])
+        if (self.state.current_menu == MENU_MQTT and self.view_mode == 0 and
+                self.state.chart_mode == 3):
+            self.invalidate()
     
     def render(self):
         """Render energy data based on view mode"""
-        if self.view_mode == 0:
-            self._render_current_data()
-        elif self.view_mode == 1:
-            self._render_24h_view()
-        elif self.view_mode == 2:
-            self._render_7d_view()
+        # Only a new view can have been prefetched; redraws in place go straight to the widgets
+        view = (self.view_mode, self.state.chart_mode, self.state.current_page)
+        changed = view != self._shown_view or self.display.frame_serial != self._shown_serial
+        if not (changed and self._show_prefetched_view(*view)):
+            if self.view_mode == 0:
+                self._render_current_data()
+            elif self.view_mode == 1:
+                self._render_24h_view()
+            elif self.view_mode == 2:
+                self._render_7d_view()
+        self._shown_view = view
+        self._shown_serial = self.display.frame_serial
+    
+    def _show_prefetched_view(self, view_mode, chart_mode, page):
+        """Show a view's prefetched frame, patching in the current view's status bar live"""
+        frame = self.view_state(view_mode, chart_mode, page)
+        if frame is None or not self.show_prefetched(frame[0]):
+            return False
+        if view_mode == 0:
+            self._update_status_bar()
+            image = self.get_layer(*frame)
+            self.status_bar.draw(TextDraw(image))
+            box = clip(self.status_bar.bounds)
+            if box:
+                self.display.show_regions(image, [box])
+            self.release(image)
+        return True
     
     def _render_current_data(self):
         """Render current real-time data"""
@@ -29,6 +113,9 @@ class EnergyMenu(BaseRenderer):
         elif self.state.chart_mode == 2:  # Line chart
             currents = [p.get("current", 0) for p in self.state.energy_data.get("phases", [])]
             self.chart_renderer.draw_line_chart(currents)
+        elif self.state.chart_mode == 3:  # Live strip chart
+            self.live_title.update(fill=self.get_text_color())
+            self.live_screen.render()
     
     def _render_text_with_status(self):
         """Render scrolling text with status bar"""
@@ -36,52 +123,35 @@ class EnergyMenu(BaseRenderer):
             self.render_message("No energy metrics")
             return
         
-        index = self.state.current_page % len(self.state.energy_metrics)
-        
-        image = self.get_background()
-        draw = ImageDraw.Draw(image)
-        
-        # Status bar at top
-        self._draw_status_bar(draw)
+        self.current_arrow.update(fill=self.get_selected_color())
+        self._update_status_bar()
         
         # Main content
-        lines = self.wrap_text(self.state.energy_metrics[index], self.get_font(), 220)
-        y = 50  # Lower to make room for status bar
-        for line in lines:
-            draw.text((20, y), line, fill=self.get_text_color(), font=self.get_font())
-            y += 30
-        
-        # Navigation arrows
-        arrow_x = SCREEN_WIDTH // 2 - 10
-        draw.text((arrow_x, SCREEN_HEIGHT - 30), "▼", fill=self.get_selected_color(), font=self.get_font())
-        
-        # View mode indicator
-        view_text = "Current"
-        view_font = self.get_font(14)
-        view_w = view_font.getlength(view_text)
-        draw.text((SCREEN_WIDTH - view_w - 10, SCREEN_HEIGHT - 25), view_text, 
-                 fill="gray", font=view_font)
+        self.metrics_text.update(lines=self._metrics_lines(self.state.current_page),
+                                 fill=self.get_text_color())
         
-        self.display.show_image(image)
-        del draw
-        del image
+        self.current_screen.render()
     
-    def _draw_status_bar(self, draw):
-        """Draw status bar with battery and time since last update"""
-        status_font = self.get_font(14)
-        
+    def _metrics_lines(self, page):
+        """Wrapped lines of a metrics page"""
+        metrics = self.state.energy_metrics
+        return tuple(self.wrap_text(metrics[page % len(metrics)], self.get_font(), 220))
+    
+    def _status_texts(self):
+        """Battery and time since last update for the status bar"""
         # Battery
         battery = self.state.energy_data.get('battery', None)
-        if battery is not None:
-            battery_text = f"🔋 {battery:.0f}%"
-            draw.text((25, 25), battery_text, fill=self.get_selected_color(), font=status_font)
+        battery_text = f"🔋 {battery:.0f}%" if battery is not None else ""
         
         # Time since last data
-        if self.energy_analyzer:
-            time_text = self.energy_analyzer.get_time_since_last_data()
-            time_w = status_font.getlength(time_text)
-            draw.text((SCREEN_WIDTH - time_w - 10, 10), time_text, 
-                     fill="gray", font=status_font)
+        time_text = self.energy_analyzer.get_time_since_last_data() if self.energy_analyzer else ""
+        return battery_text, time_text
+    
+    def _update_status_bar(self):
+        """Update status bar with battery and time since last update"""
+        battery_text, time_text = self._status_texts()
+        self.status_bar.update(left_text=battery_text, right_text=time_text,
+                               left_fill=self.get_selected_color())
     
     def _render_24h_view(self):
         """Render 24 hour analysis"""
@@ -94,41 +164,12 @@ class EnergyMenu(BaseRenderer):
             self.render_message("No 24h data\nyet")
             return
         
-        image = self.get_background()
-        draw = ImageDraw.Draw(image)
-        
-        # Title
-        title = "Last 24 Hours"
-        title_font = self.get_font(20)
-        title_w = title_font.getlength(title)
-        draw.text(((SCREEN_WIDTH - title_w) // 2, 10), title, 
-                 fill=self.get_selected_color(), font=title_font)
-        
-        # Stats
-        stats_font = self.get_font(18)
-        y = 40
-        
-        stats_text = [
-            f"Avg Power: {stats['avg_power']:.1f} W",
-            f"Max Power: {stats['max_power']:.1f} W",
-            f"Min Power: {stats['min_power']:.1f} W",
-            f"Energy: {stats['total_energy']:.2f} kWh",
-            f"Samples: {stats['data_points']}"
-        ]
-        
-        for text in stats_text:
-            draw.text((20, y), text, fill=self.get_text_color(), font=stats_font)
-            y += 28
-        
-        # Draw mini chart
-        self.chart_renderer.draw_trend_chart(
-            draw, self.energy_analyzer.get_chart_data_24h(), 
-            y + 10, 80, "24h"
-        )
+        self.title_24h.update(fill=self.get_selected_color())
+        self.stats_24h.update(lines=self._stats_24h_lines(stats), fill=self.get_text_color())
+        # Mini chart
+        self.chart_24h.update(data=self.energy_analyzer.get_power_series_24h())
         
-        self.display.show_image(image)
-        del draw
-        del image
+        self.screen_24h.render()
     
     def _render_7d_view(self):
         """Render 7 day analysis"""
@@ -141,42 +182,81 @@ class EnergyMenu(BaseRenderer):
             self.render_message("No 7d data\nyet")
             return
         
-        image = self.get_background()
-        draw = ImageDraw.Draw(image)
+        self.title_7d.update(fill=self.get_selected_color())
+        self.stats_7d.update(lines=self._stats_7d_lines(stats), fill=self.get_text_color())
+        # Mini chart
+        self.chart_7d.update(data=self.energy_analyzer.get_power_series_7d())
         
-        # Title
-        title = "Last 7 Days"
-        title_font = self.get_font(20)
-        title_w = title_font.getlength(title)
-        draw.text(((SCREEN_WIDTH - title_w) // 2, 10), title, 
-                 fill=self.get_selected_color(), font=title_font)
-        
-        # Stats
-        stats_font = self.get_font(18)
-        y = 40
-        
-        stats_text = [
+        self.screen_7d.render()
+    
+    def _stats_24h_lines(self, stats):
+        """Stats lines of the 24h view"""
+        return (
+            f"Avg Power: {stats['avg_power']:.1f} W",
+            f"Max Power: {stats['max_power']:.1f} W",
+            f"Min Power: {stats['min_power']:.1f} W",
+            f"Energy: {stats['total_energy']:.2f} kWh",
+            f"Samples: {stats['data_points']}"
+        )
+    
+    def _stats_7d_lines(self, stats):
+        """Stats lines of the 7d view"""
+        return (
             f"Avg Power: {stats['avg_power']:.1f} W",
             f"Max Power: {stats['max_power']:.1f} W",
             f"Total Energy: {stats['total_energy']:.2f} kWh",
             f"Samples: {stats['data_points']}"
-        ]
-        
-        for text in stats_text:
-            draw.text((20, y), text, fill=self.get_text_color(), font=stats_font)
-            y += 30
-        
-        # Draw mini chart
-        self.chart_renderer.draw_trend_chart(
-            draw, self.energy_analyzer.get_chart_data_7d(), 
-            y + 10, 70, "7d"
         )
+    
+    def view_state(self, view_mode, chart_mode, page):
+        """Prefetch key and draw function of a view, or None for views drawn live or without data"""
+        if view_mode == 0:
+            if chart_mode != 0 or not self.state.energy_metrics:
+                return None
+            lines = self._metrics_lines(page)
+            # The status bar's time since the last reading changes every second, so it stays
+            # out of the frame and its key; it is patched in when the frame is shown
+            widgets = [self.current_arrow.replace(fill=self.get_selected_color()), self.current_label,
+                       self.metrics_text.replace(lines=lines, fill=self.get_text_color())]
+            return ("energy_current", lines), painter(widgets)
         
-        self.display.show_image(image)
-        del draw
-        del image
+        if not self.energy_analyzer:
+            return None
+        if view_mode == 1:
+            stats = self.energy_analyzer.get_24h_stats()
+            if not stats:
+                return None
+            lines = self._stats_24h_lines(stats)
+            widgets = [self.title_24h.replace(fill=self.get_selected_color()),
+                       self.stats_24h.replace(lines=lines, fill=self.get_text_color()),
+                       self.chart_24h.replace(data=self.energy_analyzer.get_power_series_24h())]
+            return ("energy_24h", lines, self.energy_analyzer.revision), painter(widgets)
+        if view_mode == 2:
+            stats = self.energy_analyzer.get_7d_stats()
+            if not stats:
+                return None
+            lines = self._stats_7d_lines(stats)
+            widgets = [self.title_7d.replace(fill=self.get_selected_color()),
+                       self.stats_7d.replace(lines=lines, fill=self.get_text_color()),
+                       self.chart_7d.replace(data=self.energy_analyzer.get_power_series_7d())]
+            return ("energy_7d", lines, self.energy_analyzer.revision), painter(widgets)
+        return None
+    
+    def prefetch_states(self):
+        """Views a swipe or tap leads to from the current one"""
+        page = self.state.current_page
+        chart_mode = self.state.chart_mode
+        if self.view_mode == 0:
+            states = [self.view_state(1, chart_mode, page)]
+            if chart_mode == 0 and self.state.energy_metrics:
+                states += [self.view_state(0, 0, page - 1), self.view_state(0, 0, page + 1)]
+            return states
+        if self.view_mode == 1:
+            return [self.view_state(2, chart_mode, page)]
+        # A tap on the 7d view moves on to the next chart mode
+        return [self.view_state(0, (chart_mode + 1) % 4, page)]
     
-    def handle_gesture(self, gesture, touch_device=None):  
+    def handle_gesture(self, gesture, point=None):  
         """Handle energy menu gestures"""
         if not self.state.energy_metrics and self.view_mode == 0:
             if gesture in [GESTURE_LEFT, GESTURE_LONG_PRESS]:
@@ -186,19 +266,19 @@ class EnergyMenu(BaseRenderer):
         if gesture == GESTURE_UP:
             if self.view_mode == 0:
                 self.state.current_page = (self.state.current_page - 1) % len(self.state.energy_metrics)
-            self.render()
+            self.invalidate()
         elif gesture == GESTURE_DOWN:
             if self.view_mode == 0:
                 self.state.current_page = (self.state.current_page + 1) % len(self.state.energy_metrics)
-            self.render()
+            self.invalidate()
         elif gesture == GESTURE_TAP:
             # Cycle: current -> 24h -> 7d -> chart modes -> current
             if self.view_mode < 2:
                 self.view_mode += 1
             elif self.view_mode == 2:
                 self.view_mode = 0
-                self.state.chart_mode = (self.state.chart_mode + 1) % 3
-            self.render()
+                self.state.chart_mode = (self.state.chart_mode + 1) % 4
+            self.invalidate()
         elif gesture in [GESTURE_LEFT, GESTURE_LONG_PRESS]:
             self.view_mode = 0
             return MENU_MAIN
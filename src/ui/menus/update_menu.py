@@ -1,8 +1,8 @@
 """Update menu"""
-import time
-from PIL import ImageDraw
+import os
 from ui.renderer import BaseRenderer
 from config.constants import *
+from config.glyphs import TextDraw
 
 class UpdateMenu(BaseRenderer):
     def __init__(self, display, state, update_checker):
@@ -11,18 +11,11 @@ class UpdateMenu(BaseRenderer):
     
     def render(self):
         """Render update screen"""
-        image = self.get_background()
-        draw = ImageDraw.Draw(image)
+        image = self.get_layer("update", self._draw_update_chrome)
+        draw = TextDraw(image)
         
         info = self.update_checker.get_update_info()
         
-        # Title
-        title = "Update Available"
-        title_font = self.get_font(20)
-        title_w = title_font.getlength(title)
-        draw.text(((SCREEN_WIDTH - title_w) // 2, 20), title, 
-                 fill=self.get_selected_color(), font=title_font)
-        
         # Version info
         info_font = self.get_font(16)
         y = 60
@@ -33,20 +26,27 @@ class UpdateMenu(BaseRenderer):
         
         latest_text = f"Latest:  {info['latest']}"
         draw.text((20, y), latest_text, fill=self.get_selected_color(), font=info_font)
-        y += 40
+        
+        self.display.show_image(image)
+        self.release(image)
+    
+    def _draw_update_chrome(self, draw):
+        """Draw the static title, prompt and buttons"""
+        # Title
+        title = "Update Available"
+        title_font = self.get_font(20)
+        title_w = self.text_width(title, title_font)
+        draw.text(((SCREEN_WIDTH - title_w) // 2, 20), title, 
+                 fill=self.get_selected_color(), font=title_font)
         
         # Message
         msg = "Update now?"
-        msg_w = self.get_font().getlength(msg)
-        draw.text(((SCREEN_WIDTH - msg_w) // 2, y), msg, 
+        msg_w = self.text_width(msg)
+        draw.text(((SCREEN_WIDTH - msg_w) // 2, 125), msg, 
                  fill=self.get_text_color(), font=self.get_font())
         
         # Buttons
         self._draw_update_buttons(draw)
-        
-        self.display.show_image(image)
-        del draw
-        del image
     
     def _draw_update_buttons(self, draw):
         """Draw Update/Cancel buttons"""
@@ -61,7 +61,7 @@ class UpdateMenu(BaseRenderer):
                       outline=self.get_text_color(), width=2)
         cancel_text = "Cancel"
         cancel_font = self.get_font(18)
-        cancel_w = cancel_font.getlength(cancel_text)
+        cancel_w = self.text_width(cancel_text, cancel_font)
         draw.text((start_x + (box_w - cancel_w) // 2, box_y + 15), cancel_text, 
                  fill=self.get_text_color(), font=cancel_font)
         
@@ -70,18 +70,17 @@ class UpdateMenu(BaseRenderer):
                        start_x + 2 * box_w + spacing, box_y + box_h], 
                       outline=self.get_selected_color(), width=2)
         update_text = "Update"
-        update_w = cancel_font.getlength(update_text)
+        update_w = self.text_width(update_text, cancel_font)
         draw.text((start_x + box_w + spacing + (box_w - update_w) // 2, box_y + 15), 
                  update_text, fill=self.get_selected_color(), font=cancel_font)
     
-    def handle_gesture(self, gesture, touch_device=None):
+    def handle_gesture(self, gesture, point=None):
         """Handle update menu gestures"""
         if gesture == GESTURE_LONG_PRESS:
             return MENU_MAIN
         
-        if gesture == GESTURE_TAP and touch_device:
-            touch_device.get_point()
-            x, y = touch_device.X_point, touch_device.Y_point
+        if gesture == GESTURE_TAP and point:
+            x, y = point
             
             box_w, box_h = 90, 50
             box_y = 140
@@ -96,21 +95,22 @@ class UpdateMenu(BaseRenderer):
             elif start_x + box_w + spacing <= x <= start_x + 2 * box_w + spacing and \
                  box_y <= y <= box_y + box_h:
                 self._perform_update()
-                return MENU_MAIN
+                return None
         
         return None
     
     def _perform_update(self):
         """Execute the update"""
         self.render_message("Updating...\nPlease wait")
-        time.sleep(1)
-        
-        success, message = self.update_checker.perform_update()
-        
-        self.render_message(message)
-        time.sleep(3)
-        
-        if success:
-            # Restart the service
-            import os
-            os.system("sudo systemctl restart screen.service")
\ No newline at end of file
+        self.run_task(self.update_checker.perform_update, self._show_update_result)
+    
+    def _show_update_result(self, result):
+        """Show the update outcome for a few seconds, then restart or go back to the main menu"""
+        success, message = result or (False, "Update failed")
+        then = self._restart if success else lambda: self.go_to(MENU_MAIN)
+        self.show_toast(message, then=then, duration=3)
+    
+    def _restart(self):
+        """Restart the service to run the updated code"""
+        os.system("sudo systemctl restart screen.service")
+        self.go_to(MENU_MAIN)
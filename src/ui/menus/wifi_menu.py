@@ -1,27 +1,42 @@
 """WiFi menu rendering and handling"""
 import time
 import logging
-from PIL import ImageDraw  
 from ui.renderer import BaseRenderer
+from core.scheduler import TASK
+from ui.components.marquee import Marquee
 from config.constants import *
 from config.themes import WIFI_MENU_EMOJIS
+from config.glyphs import TextDraw
 
 class WiFiMenu(BaseRenderer):
     def __init__(self, display, state, wifi_service):
         super().__init__(display, state)
         self.wifi_service = wifi_service
         self.options = ["Pair Devices", "Change WiFi", "Saved Networks", "Remove WiFi"]
+        # What our last frame showed, its display serial, and the marquee scrolling in it
+        self._view_key = None
+        self._view_serial = None
+        self._marquee = None
     
     def render(self):
         """Render WiFi setup menu"""
-        image = self.get_background()
-        draw = ImageDraw.Draw(image)
-        
+        self.show_layer(*self._menu_state(self.state.wifi_selected))
+    
+    def atlas_states(self):
+        """Every selection of the menu for the frame atlas"""
+        return [self._menu_state(i) for i in range(len(self.options))]
+    
+    def _menu_state(self, selected):
+        """Layer key and draw function for one selection"""
+        return ("wifi", selected), lambda draw: self._draw_menu(draw, selected)
+    
+    def _draw_menu(self, draw, selected):
+        """Draw the menu with the given option selected"""
         height = len(self.options) * 40
         y_start = (SCREEN_HEIGHT - height) // 2
         
         for i, item in enumerate(self.options):
-            is_selected = (i == self.state.wifi_selected)
+            is_selected = (i == selected)
             color = self.get_selected_color() if is_selected else self.get_text_color()
             
             emoji = WIFI_MENU_EMOJIS.get(item, '')
@@ -33,45 +48,39 @@ class WiFiMenu(BaseRenderer):
             draw.text((emoji_x, y_pos), emoji, fill=color, font=self.get_font())
             # Draw text
             draw.text((text_x, y_pos), item, fill=color, font=self.get_font())
-        
-        self.display.show_image(image)
-        del draw
-        del image
     
     def render_saved_networks(self):
         """Render saved networks list with scrolling"""
         current_time = time.time()
         
-        # Throttle rendering
-        if current_time - self.state.last_render_time < RENDER_THROTTLE:
-            return True
-        
-        self.state.last_render_time = current_time
-        
         if not self.state.saved_networks_list:
             self.state.saved_networks_list = self.wifi_service.get_saved_networks()
             self.state.saved_networks_selected = 0
         
         if not self.state.saved_networks_list:
-            self.render_message("No saved\nnetworks found")
-            time.sleep(2)
+            self.state.in_saved_networks_mode = False
+            self.show_toast("No saved\nnetworks found")
             return False
         
-        image = self.get_background()
-        draw = ImageDraw.Draw(image)
-        
-        # Title
-        title = "Saved Networks"
-        title_font = self.get_font(18)
-        title_w = title_font.getlength(title)
-        draw.text(((SCREEN_WIDTH - title_w) // 2, 30), title, 
-                 fill=self.get_selected_color(), font=title_font)
-        
         # Get current SSID
         current = self.wifi_service.get_current_ssid()
         
-        network_font = self.get_font(20)
+        # Unchanged screen: only the selected row's marquee moves
+        view_key = ("saved_networks", self.state.active_theme.name, tuple(self.state.saved_networks_list),
+                    self.state.saved_networks_selected, current)
+        if view_key == self._view_key and self.display.frame_serial == self._view_serial:
+            self._marquee_tick(current_time)
+            return True
+        self._view_key = view_key
+        self._marquee = None
+        
         display_count = 4
+        show_scroll = len(self.state.saved_networks_list) > display_count
+        image = self.get_layer(("saved_networks", show_scroll),
+                               lambda draw: self._draw_saved_networks_chrome(draw, show_scroll))
+        draw = TextDraw(image)
+        
+        network_font = self.get_font(20)
         item_spacing = 32
         
         start_idx = max(0, self.state.saved_networks_selected - 1)
@@ -80,14 +89,6 @@ class WiFiMenu(BaseRenderer):
         y_start = 60
         current_y = y_start
         
-        selected_network = self.state.saved_networks_list[self.state.saved_networks_selected]
-        
-        # Reset scroll if selection changed
-        if selected_network != self.state.last_selected_network:
-            self.state.scroll_offset = 0
-            self.state.last_scroll_time = current_time
-            self.state.last_selected_network = selected_network
-        
         # Render networks
         for i in range(start_idx, end_idx):
             network = self.state.saved_networks_list[i]
@@ -97,109 +98,133 @@ class WiFiMenu(BaseRenderer):
             color = self.get_selected_color() if is_selected else self.get_text_color()
             
             if is_selected:
-                text = self._get_scrolling_text(network, is_current, current_time)
+                self._draw_selected_network(draw, image, network, is_current, network_font,
+                                            color, current_y, current_time)
             else:
                 prefix = "  "
                 suffix = " ✓" if is_current else ""
                 display_name = network[:17] if len(network) > 17 else network
                 text = f"{prefix}{display_name}{suffix}"
-            
-            draw.text((10, current_y), text, fill=color, font=network_font)
+                draw.text((10, current_y), text, fill=color, font=network_font)
             current_y += item_spacing
         
+        self._show_view(image)
+        self.release(image)
+        return True
+    
+    def _draw_saved_networks_chrome(self, draw, show_scroll):
+        """Draw the static title, scroll hint and instructions of the saved networks list"""
+        # Title
+        title = "Saved Networks"
+        title_font = self.get_font(18)
+        title_w = self.text_width(title, title_font)
+        draw.text(((SCREEN_WIDTH - title_w) // 2, 30), title, 
+                 fill=self.get_selected_color(), font=title_font)
+        
         # Scroll indicators
-        if len(self.state.saved_networks_list) > display_count:
+        if show_scroll:
             scroll_font = self.get_font(14)
             scroll_text = "▲▼"
-            scroll_w = scroll_font.getlength(scroll_text)
+            scroll_w = self.text_width(scroll_text, scroll_font)
             draw.text(((SCREEN_WIDTH - scroll_w) // 2, 190), scroll_text, 
                      fill=self.get_selected_color(), font=scroll_font)
         
         # Instructions
         instruction_font = self.get_font(14)
         instruction_text = "Tap=Connect"
-        instruction_w = instruction_font.getlength(instruction_text)
+        instruction_w = self.text_width(instruction_text, instruction_font)
         draw.text(((SCREEN_WIDTH - instruction_w) // 2, 210), instruction_text, 
                  fill="gray", font=instruction_font)
-        
-        self.display.show_image(image)
-        del draw
-        del image
-        return True
     
-    def _get_scrolling_text(self, network, is_current, current_time):
-        """Get scrolling text for selected network"""
+    def _draw_selected_network(self, draw, image, network, is_current, font, color, y, current_time):
+        """Draw the selected row, handing SSIDs too long for the row to a marquee"""
         prefix = "➤ "
         suffix = " ✓" if is_current else ""
-        max_chars = 18
-        
-        if len(network) > max_chars:
-            # Scrolling text
-            display_network = network + "  ...  " + network[:10]
-            
-            if current_time - self.state.last_scroll_time > SCROLL_SPEED:
-                self.state.scroll_offset = (self.state.scroll_offset + 1) % (len(network) + 7)
-                self.state.last_scroll_time = current_time
-            
-            visible_text = display_network[self.state.scroll_offset:self.state.scroll_offset + max_chars]
-            return prefix + visible_text + suffix
-        else:
-            self.state.scroll_offset = 0
-            return prefix + network + suffix
+        x = 10
+        name_x = x + round(self.text_width(prefix, font))
+        suffix_w = round(self.text_width(suffix, font)) if suffix else 0
+        name_w = SAVED_NETWORK_ROW_WIDTH - (name_x - x) - suffix_w
+        
+        if self.text_width(network, font) <= name_w:
+            draw.text((x, y), prefix + network + suffix, fill=color, font=font)
+            return
+        
+        draw.text((x, y), prefix, fill=color, font=font)
+        if suffix:
+            draw.text((name_x + name_w, y), suffix, fill=color, font=font)
+        self._start_marquee(Marquee(network, font, color, name_x, y, name_w), image, current_time)
+    
+    def _show_view(self, image):
+        """Show a full frame and remember it as ours for later marquee ticks"""
+        self.display.show_image(image)
+        self._view_serial = self.display.frame_serial
+    
+    def _marquee_tick(self, current_time):
+        """Advance the marquee of the screen we showed last"""
+        if self._marquee is not None and self._marquee.tick(self.display, current_time):
+            self._view_serial = self.display.frame_serial
+    
+    def _start_marquee(self, marquee, image, current_time):
+        """Put a marquee on the frame being composed and let the scheduler animate it"""
+        self._marquee = marquee
+        marquee.attach(image, current_time)
+        self.display.scheduler.animate(self._animate_marquee, key="marquee")
+    
+    def _animate_marquee(self):
+        """Scheduler animation step; ends once another frame replaced ours"""
+        if self._marquee is None or self.display.frame_serial != self._view_serial:
+            return False
+        self._marquee_tick(time.time())
+        return True
     
     def render_network_confirmation(self):
         """Render network connection confirmation dialog"""
         current_time = time.time()
         network_name = self.state.network_to_connect
         
-        image = self.get_background()
-        draw = ImageDraw.Draw(image)
+        # Unchanged dialog: only the network name's marquee moves
+        view_key = ("network_confirmation", self.state.active_theme.name, network_name)
+        if view_key == self._view_key and self.display.frame_serial == self._view_serial:
+            self._marquee_tick(current_time)
+            return
+        self._view_key = view_key
+        self._marquee = None
         
-        # Message
-        msg_font = self.get_font(18)
-        msg1 = "Connect to:"
-        msg1_w = msg_font.getlength(msg1)
-        draw.text(((SCREEN_WIDTH - msg1_w) // 2, 30), msg1, 
-                 fill=self.get_text_color(), font=msg_font)
+        image = self.get_layer("network_confirmation", self._draw_network_confirmation_chrome)
+        draw = TextDraw(image)
         
-        # Network name with scrolling
+        # Network name, scrolling when wider than the slot
         net_font = self.get_font(18)
-        max_chars = 20
+        net_w = self.text_width(network_name, net_font)
         
-        # Reset scroll if new network
-        if network_name != self.state.last_selected_network:
-            self.state.scroll_offset = 0
-            self.state.last_scroll_time = current_time
-            self.state.last_selected_network = network_name
-        
-        if len(network_name) > max_chars:
-            display_network = network_name + "  ...  " + network_name[:10]
-            
-            if current_time - self.state.last_scroll_time > SCROLL_SPEED:
-                self.state.scroll_offset = (self.state.scroll_offset + 1) % (len(network_name) + 7)
-                self.state.last_scroll_time = current_time
-            
-            network_display = display_network[self.state.scroll_offset:self.state.scroll_offset + max_chars]
+        if net_w <= NETWORK_NAME_WIDTH:
+            draw.text(((SCREEN_WIDTH - net_w) // 2, 55), network_name, 
+                     fill=self.get_selected_color(), font=net_font)
         else:
-            network_display = network_name
-            self.state.scroll_offset = 0
+            marquee = Marquee(network_name, net_font, self.get_selected_color(),
+                              (SCREEN_WIDTH - NETWORK_NAME_WIDTH) // 2, 55, NETWORK_NAME_WIDTH)
+            self._start_marquee(marquee, image, current_time)
         
-        net_w = net_font.getlength(network_display)
-        draw.text(((SCREEN_WIDTH - net_w) // 2, 55), network_display, 
-                 fill=self.get_selected_color(), font=net_font)
+        self._show_view(image)
+        self.release(image)
+    
+    def _draw_network_confirmation_chrome(self, draw):
+        """Draw the static prompt and buttons of the connection dialog"""
+        # Message
+        msg_font = self.get_font(18)
+        msg1 = "Connect to:"
+        msg1_w = self.text_width(msg1, msg_font)
+        draw.text(((SCREEN_WIDTH - msg1_w) // 2, 30), msg1, 
+                 fill=self.get_text_color(), font=msg_font)
         
         # Question mark
         msg2 = "?"
-        msg2_w = msg_font.getlength(msg2)
+        msg2_w = self.text_width(msg2, msg_font)
         draw.text(((SCREEN_WIDTH - msg2_w) // 2, 80), msg2, 
                  fill=self.get_text_color(), font=msg_font)
         
         # Buttons
         self._draw_yes_no_buttons(draw)
-        
-        self.display.show_image(image)
-        del draw
-        del image
     
     def _draw_yes_no_buttons(self, draw):
         """Draw Yes/No confirmation buttons"""
@@ -213,7 +238,7 @@ class WiFiMenu(BaseRenderer):
         draw.rectangle([start_x, box_y, start_x + box_w, box_y + box_h], 
                       outline=self.get_text_color(), width=2)
         no_text = "No"
-        no_w = self.get_font().getlength(no_text)
+        no_w = self.text_width(no_text)
         draw.text((start_x + (box_w - no_w) // 2, box_y + 12), no_text, 
                  fill=self.get_text_color(), font=self.get_font())
         
@@ -222,7 +247,7 @@ class WiFiMenu(BaseRenderer):
                        start_x + 2 * box_w + spacing, box_y + box_h], 
                       outline=self.get_selected_color(), width=2)
         yes_text = "Yes"
-        yes_w = self.get_font().getlength(yes_text)
+        yes_w = self.text_width(yes_text)
         draw.text((start_x + box_w + spacing + (box_w - yes_w) // 2, box_y + 12), 
                  yes_text, fill=self.get_selected_color(), font=self.get_font())
     
@@ -241,19 +266,18 @@ class WiFiMenu(BaseRenderer):
         qr_y = 20
         image.paste(qr_resized, (qr_x, qr_y))
         
-        draw = ImageDraw.Draw(image)
+        draw = TextDraw(image)
         url_font = self.get_font(16)
-        url_w = url_font.getlength(url)
+        url_w = self.text_width(url, url_font)
         url_x = (SCREEN_WIDTH - url_w) // 2
         url_y = qr_y + qr_size + 10
         
         draw.text((url_x, url_y), url, fill=self.get_selected_color(), font=url_font)
         
         self.display.show_image(image)
-        del draw
-        del image
+        self.release(image)
     
-    def handle_gesture(self, gesture, touch_device=None):
+    def handle_gesture(self, gesture, point=None):
         """Handle WiFi menu gestures"""
         # Handle saved networks mode
         if self.state.in_saved_networks_mode:
@@ -266,10 +290,10 @@ class WiFiMenu(BaseRenderer):
         # Normal WiFi menu navigation
         if gesture == GESTURE_UP:
             self.state.wifi_selected = (self.state.wifi_selected - 1) % len(self.options)
-            self.render()
+            self.invalidate()
         elif gesture == GESTURE_DOWN:
             self.state.wifi_selected = (self.state.wifi_selected + 1) % len(self.options)
-            self.render()
+            self.invalidate()
         elif gesture == GESTURE_TAP:
             return self._handle_wifi_selection()
         elif gesture in [GESTURE_LEFT, GESTURE_LONG_PRESS]:
@@ -284,11 +308,11 @@ class WiFiMenu(BaseRenderer):
         elif gesture == GESTURE_UP:
             self.state.saved_networks_selected = \
                 (self.state.saved_networks_selected - 1) % len(self.state.saved_networks_list)
-            self.render_saved_networks()
+            self.invalidate()
         elif gesture == GESTURE_DOWN:
             self.state.saved_networks_selected = \
                 (self.state.saved_networks_selected + 1) % len(self.state.saved_networks_list)
-            self.render_saved_networks()
+            self.invalidate()
         elif gesture == GESTURE_TAP:
             self.state.network_to_connect = self.state.saved_networks_list[self.state.saved_networks_selected]
             self.state.in_saved_networks_mode = False
@@ -309,8 +333,6 @@ class WiFiMenu(BaseRenderer):
     
     def _handle_wifi_selection(self):
         """Handle WiFi menu selection"""
-        time.sleep(0.1)
-        
         if self.state.wifi_selected == 0:  # Pair Devices
             self._handle_pair_devices()
             return None
@@ -323,7 +345,6 @@ class WiFiMenu(BaseRenderer):
             self.state.saved_networks_selected = 0
             if not self.render_saved_networks():
                 self.state.in_saved_networks_mode = False
-            time.sleep(0.2)
             return None
         elif self.state.wifi_selected == 3:  # Remove WiFi
             self._handle_remove_wifi()
@@ -331,53 +352,45 @@ class WiFiMenu(BaseRenderer):
     
     def _handle_pair_devices(self):
         """Handle device pairing"""
-        from services.network_service import NetworkService
-        
-        self.render_loading_animation("Pairing", 2)
-        network_service = NetworkService(self)
-        success, message = network_service.ensure_orion_connection()
-        self.render_message(message)
-        time.sleep(2)
-        self.render()
+        self.render_loading_animation("Pairing")
+        self._connect_orion(delay=2)
     
     def _handle_change_wifi(self):
         """Handle WiFi change"""
+        self.render_message("Triggering\nAP mode...")
+        self.render_loading_animation("Switching")
+        self._connect_orion(delay=8)
+    
+    def _connect_orion(self, delay=0):
+        """Run the Orion connection flow in the background after delay seconds, then show its outcome"""
         from services.network_service import NetworkService
         
-        self.render_message("Triggering\nAP mode...")
-        self.render_loading_animation("Switching", 8)
-        network_service = NetworkService(self)
-        success, message = network_service.ensure_orion_connection()
-        self.render_message(message)
-        time.sleep(2)
-        self.render()
+        messages = _TaskMessages(self)
+        
+        def work():
+            time.sleep(delay)
+            if messages.task is not None and messages.task.cancelled:
+                return None
+            return NetworkService(messages).ensure_orion_connection()
+        
+        messages.task = self.run_task(work, self._show_connection_result)
+    
+    def _show_connection_result(self, result):
+        """Toast the connection flow's message, then return to the WiFi menu"""
+        success, message = result or (False, "❌ Failed")
+        self.show_toast(message)
     
     def _handle_remove_wifi(self):
         """Handle WiFi removal"""
         current = self.wifi_service.get_current_ssid()
-        if current:
-            self.render_message(f"Removing\n{current}...")
-            if self.wifi_service.disconnect_wifi():
-                self.render_message("✅ WiFi removed")
-            else:
-                self.render_message("❌ Failed to\nremove")
-        else:
-            self.render_message("No active\nconnection")
-        time.sleep(2)
-        self.render()
+        if not current:
+            self.show_toast("No active\nconnection")
+            return
+        self.render_message(f"Removing\n{current}...")
+        self.run_task(self.wifi_service.disconnect_wifi,
+                      lambda removed: self.show_toast("✅ WiFi removed" if removed else "❌ Failed to\nremove"))
     
-    def render_loading_animation(self, message, duration=3):
-        """Show animated loading message"""
-        start_time = time.time()
-        dots = 0
-        
-        while time.time() - start_time < duration:
-            dot_str = "." * (dots % 4)
-            self.render_message(f"{message}{dot_str}")
-            time.sleep(0.5)
-            dots += 1
-    
-    def handle_confirmation_gesture(self, gesture, touch_device):
+    def handle_confirmation_gesture(self, gesture, point=None):
         """Handle network confirmation gestures"""
         if gesture == 0:
             return None
@@ -386,9 +399,8 @@ class WiFiMenu(BaseRenderer):
             self.state.in_saved_networks_mode = True
             return MENU_WIFI
         
-        if gesture == GESTURE_TAP:
-            touch_device.get_point()
-            x, y = touch_device.X_point, touch_device.Y_point
+        if gesture == GESTURE_TAP and point:
+            x, y = point
             
             box_w, box_h = 90, 50
             box_y = 130
@@ -398,18 +410,43 @@ class WiFiMenu(BaseRenderer):
             # NO box
             if start_x <= x <= start_x + box_w and box_y <= y <= box_y + box_h:
                 self.state.in_saved_networks_mode = True
-                time.sleep(0.2)
                 return MENU_WIFI
             # YES box
             elif start_x + box_w + spacing <= x <= start_x + 2 * box_w + spacing and \
                  box_y <= y <= box_y + box_h:
-                if self.wifi_service.connect_to_saved_network(self.state.network_to_connect):
-                    self.render_message("✅ Connected")
-                else:
-                    self.render_message("❌ Failed")
-                time.sleep(2)
-                self.state.in_saved_networks_mode = False
-                self.state.saved_networks_list = []
-                return MENU_WIFI
+                network = self.state.network_to_connect
+                self.render_loading_animation("Connecting")
+                self.run_task(lambda: self.wifi_service.connect_to_saved_network(network),
+                              self._show_connect_result)
         
-        return None
\ No newline at end of file
+        return None
+    
+    def _show_connect_result(self, connected):
+        """Toast the outcome of connecting to a saved network, then go back to the WiFi menu"""
+        self.show_toast("✅ Connected" if connected else "❌ Failed", then=self._leave_confirmation)
+    
+    def _leave_confirmation(self):
+        """Back to the WiFi menu after a connection attempt"""
+        self.state.in_saved_networks_mode = False
+        self.state.saved_networks_list = []
+        self.go_to(MENU_WIFI)
+
+class _TaskMessages:
+    """Renderer handed to a background service.
+    
+    Messages from the worker thread are drawn by the frame scheduler on the
+    main loop, like the task's result; the first one ends the loading
+    animation, a newer message replaces one not yet drawn, and messages are
+    dropped once the task is cancelled.
+    """
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.task = None
+    
+    def render_message(self, message, font_size=24):
+        self.renderer.display.scheduler.request(lambda: self._show(message, font_size), TASK)
+    
+    def _show(self, message, font_size):
+        if self.task is None or not self.task.cancelled:
+            self.renderer.stop_loading()
+            self.renderer.render_message(message, font_size)
@@ -0,0 +1,128 @@
+"""Speculative rendering of the screens one gesture away"""
+import logging
+import threading
+import time
+from config.constants import PREFETCH_INTERVAL, PREFETCH_MAX_FRAMES
+
+class Prefetcher:
+    """Renders the likely next frames into the layer cache while the loop is idle.
+    
+    predict() returns (key, draw_fn) pairs, or None for neighbours that are
+    drawn live, for the screens one gesture away from the current state. Keys
+    capture all the content of a frame, so a prefetched frame is only ever
+    shown for exactly that content; menus look theirs up with
+    show_prefetched() and fall back to rendering on a miss. Predictions are
+    refreshed after every state change and every PREFETCH_INTERVAL, frames
+    no longer predicted are dropped, and a pass stops as soon as the state
+    moves on.
+    """
+    def __init__(self, display, state, predict, interval=PREFETCH_INTERVAL,
+                 max_frames=PREFETCH_MAX_FRAMES):
+        self.display = display
+        self.state = state
+        self.predict = predict
+        self.interval = interval
+        self.max_frames = max_frames
+        self._states = []
+        # (theme name, key) -> theme of the frames this prefetcher put in the layer cache
+        self._held = {}
+        self._generation = 0
+        self._next_check = 0.0
+        self._stale = True
+        self._pending = False
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {
+            'passes': 0,
+            'frames': 0,
+            'discarded': 0,
+            'aborted': 0,
+        }
+    
+    def invalidate(self):
+        """The state changed; predict again on the next refresh"""
+        self._stale = True
+    
+    def refresh(self, now=None):
+        """Re-predict if the state changed or the interval passed, and prefetch what is new"""
+        now = time.time() if now is None else now
+        if not self._stale and now < self._next_check:
+            return False
+        self._stale = False
+        self._next_check = now + self.interval
+        
+        try:
+            predicted = [entry for entry in self.predict() if entry is not None]
+        except Exception as e:
+            logging.error(f"Prefetch prediction error: {e}")
+            predicted = []
+        states = {}
+        for key, draw_fn in predicted:
+            states.setdefault(key, draw_fn)
+        states = list(states.items())[:self.max_frames]
+        
+        theme = self.state.active_theme
+        with self._lock:
+            if [(theme.name, key) for key, _ in states] == \
+                    [(t.name, key) for t, key, _ in self._states]:
+                return False
+            self._states = [(theme, key, draw_fn) for key, draw_fn in states]
+            self._generation += 1
+            self._pending = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+                self._thread.start()
+        return True
+    
+    def _run(self):
+        """Worker loop, runs until no pass is pending"""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                self._pending = False
+                generation = self._generation
+                states = list(self._states)
+            try:
+                self._prefetch(generation, states)
+            except Exception as e:
+                logging.error(f"Prefetch error: {e}")
+    
+    def _prefetch(self, generation, states):
+        """Drop frames no longer predicted, then render the predicted ones"""
+        wanted = {(theme.name, key) for theme, key, _ in states}
+        with self._lock:
+            stale = [(self._held.pop(entry), entry[1]) for entry in list(self._held) if entry not in wanted]
+        for theme, key in stale:
+            self.display.invalidate_layers(theme, [key])
+        self.stats['discarded'] += len(stale)
+        self.stats['passes'] += 1
+        
+        scheduler = self.display.scheduler
+        for theme, key, draw_fn in states:
+            # Frames the scheduler is waiting to draw come first
+            while scheduler.pending and generation == self._generation:
+                time.sleep(scheduler.frame_time)
+            if generation != self._generation or self.state.active_theme is not theme:
+                self.stats['aborted'] += 1
+                return
+            with self._lock:
+                held = (theme.name, key) in self._held
+            if held and self.display.has_layer(theme, key):
+                continue
+            self.display.prepare_layer(theme, key, draw_fn)
+            self.stats['frames'] += 1
+            if self.state.active_theme is not theme:
+                # Theme switched mid-way; this frame may mix both
+                self.display.invalidate_layers(theme, [key])
+                self.stats['aborted'] += 1
+                return
+            with self._lock:
+                self._held[(theme.name, key)] = theme
+    
+    def get_stats(self):
+        """Pass and frame counters plus how many prefetched frames are held"""
+        stats = dict(self.stats)
+        stats['held'] = len(self._held)
+        return stats
@@ -1,6 +1,11 @@
 """Base rendering functions"""
-from PIL import Image, ImageDraw, ImageFont
+import time
+from PIL import Image
 from config.constants import *
+from core.scheduler import TOAST, LOADING, TASK
+from config.fonts import get_font, text_length
+from config.glyphs import TextDraw
+from ui.layout import layout_text
 
 class BaseRenderer:
     def __init__(self, display, state):
@@ -11,9 +16,69 @@ class BaseRenderer:
         """Get fresh background"""
         return self.display.get_background_copy(self.state.active_theme)
     
+    def get_layer(self, key, draw_fn):
+        """Get a copy of the active theme's background with cached static content"""
+        return self.display.get_layer_copy(self.state.active_theme, key, draw_fn)
+    
+    def release(self, image):
+        """Return a shown canvas from get_background/get_layer to the display's pool"""
+        self.display.release_canvas(image)
+    
+    def show_layer(self, key, draw_fn):
+        """Display a fully static screen from its cached encoding"""
+        self.display.show_layer(self.state.active_theme, key, draw_fn)
+    
+    def show_prefetched(self, key):
+        """Show the frame prefetched for exactly this content, if there is one"""
+        return self.display.show_prepared(self.state.active_theme, key)
+    
+    def invalidate(self):
+        """Ask the frame scheduler to redraw the current screen on its next tick"""
+        self.display.scheduler.invalidate()
+    
+    def go_to(self, menu):
+        """Switch to another menu from a delayed callback"""
+        self.state.current_menu = menu
+        self.invalidate()
+    
+    def show_toast(self, message, then=None, duration=TOAST_DURATION):
+        """Show a message for a while, then run then() (default: redraw the current screen)"""
+        self.display.scheduler.cancel(LOADING)
+        self.render_message(message)
+        self.display.scheduler.after(duration, then or self.invalidate, key=TOAST)
+    
+    def render_loading_animation(self, message, duration=None):
+        """Animate trailing dots after message until duration passes or stop_loading()"""
+        start = time.time()
+        shown = [None]
+        
+        def step():
+            dots = int((time.time() - start) / LOADING_DOT_INTERVAL) % 4
+            if dots != shown[0]:
+                shown[0] = dots
+                self.render_message(f"{message}{'.' * dots}")
+            return True
+        
+        scheduler = self.display.scheduler
+        scheduler.animate(step, key=LOADING)
+        if duration:
+            scheduler.after(duration, self.stop_loading, key=LOADING)
+    
+    def stop_loading(self):
+        """End the loading animation"""
+        self.display.scheduler.cancel(LOADING)
+    
+    def run_task(self, work, done=None):
+        """Run blocking work off the main loop; done(result) runs on it afterwards"""
+        return self.display.scheduler.start_task(work, done, TASK)
+    
     def get_font(self, size=24):
         """Get font with specified size"""
-        return ImageFont.truetype("../Font/DejaVuSans.ttf", size)
+        return get_font(size)
+    
+    def text_width(self, text, font=None):
+        """Get cached advance width of text (default font if none given)"""
+        return text_length(font or self.get_font(), text)
     
     def get_text_color(self):
         """Get theme text color"""
@@ -25,30 +90,12 @@ class BaseRenderer:
     
     def wrap_text(self, text, font, max_width):
         """Wrap text to fit width"""
-        lines = []
-        words = text.split()
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + word + " "
-            bbox = font.getbbox(test_line)
-            width = bbox[2] - bbox[0]
-            
-            if width <= max_width:
-                current_line = test_line
-            else:
-                lines.append(current_line.strip())
-                current_line = word + " "
-        
-        if current_line:
-            lines.append(current_line.strip())
-        
-        return lines
+        return list(layout_text(text, font, max_width).lines)
     
     def render_message(self, message, font_size=24):
         """Render centered message"""
         image = self.get_background()
-        draw = ImageDraw.Draw(image)
+        draw = TextDraw(image)
         
         # Adjust font for message length
         if len(message) > 50:
@@ -60,13 +107,16 @@ class BaseRenderer:
         
         lines = message.split('\n')
         all_lines = []
+        line_widths = []
         
         for line in lines:
             if line.strip():
-                wrapped = self.wrap_text(line, font, MAX_WRAP_WIDTH)
-                all_lines.extend(wrapped)
+                layout = layout_text(line, font, MAX_WRAP_WIDTH)
+                all_lines.extend(layout.lines)
+                line_widths.extend(layout.widths)
             else:
                 all_lines.append("")
+                line_widths.append(0)
         
         line_height = font_size + 4
         total_height = len(all_lines) * line_height
@@ -74,11 +124,9 @@ class BaseRenderer:
         
         for i, line in enumerate(all_lines):
             if line:
-                line_w = font.getlength(line)
-                x = (SCREEN_WIDTH - line_w) // 2
+                x = (SCREEN_WIDTH - line_widths[i]) // 2
                 y = y_start + (i * line_height)
                 draw.text((x, y), line, fill=self.get_text_color(), font=font)
         
         self.display.show_image(image)
-        del draw
-        del image
\ No newline at end of file
+        self.release(image)
\ No newline at end of file
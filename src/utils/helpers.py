@@ -82,6 +82,7 @@ def get_device_metrics():
 def update_device_metrics_loop(state):
     """Background loop to update device metrics"""
     while True:
-        if not state.is_standby:
-            state.device_metrics_pages = get_device_metrics()
+        # Paused in standby
+        state.awake.wait()
+        state.device_metrics_pages = get_device_metrics()
         time.sleep(5)
\ No newline at end of file
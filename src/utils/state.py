@@ -1,4 +1,5 @@
 """Global application state"""
+import threading
 import time
 from config.themes import THEMES
 
@@ -33,12 +34,9 @@ class AppState:
         self.last_gesture_time = 0
         self.last_activity_time = time.time()
         self.is_standby = False
-        
-        # Scrolling state
-        self.scroll_offset = 0
-        self.last_scroll_time = 0
-        self.last_selected_network = None
-        self.last_render_time = 0
+        # Set while the device is not in (or fading into) standby; background loops wait on it
+        self.awake = threading.Event()
+        self.awake.set()
         
         # Network cache
         self.cached_current_ssid = None